@@ -1 +1 @@
-from .request import ai_request
\ No newline at end of file
+from .request import ai_request, close_providers
\ No newline at end of file
@@ -1,8 +1,39 @@
 from abc import ABC, abstractmethod
+import asyncio
+from contextlib import asynccontextmanager
 import logging
+import time
+import weakref
+from aiolimiter import AsyncLimiter
+import httpx
 
 logger = logging.getLogger(__name__)
 
+# Outbound requests share one budget across every provider; the semaphore,
+# not the connection pool, is where excess requests queue up
+MAX_CONCURRENT_REQUESTS = 64
+HTTP_LIMITS = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=20)
+HTTP_TIMEOUT = 30.0
+
+_request_semaphores = weakref.WeakKeyDictionary()
+
+
+def request_slots() -> asyncio.Semaphore:
+    """
+    Returns the semaphore bounding concurrent outbound requests.
+
+    One semaphore is kept per event loop, since asyncio primitives
+    cannot be shared between loops.
+
+    :return: asyncio.Semaphore
+        The semaphore for the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _request_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _request_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return semaphore
+
 
 class Provider(ABC):
     """
@@ -11,9 +42,88 @@ class Provider(ABC):
     :param api_key: str
         The API key for the provider.
     """
+    __slots__ = ("api_key", "_headers", "_http_client", "_http_client_loop",
+                 "_limiter", "_retry_at")
+    base_url = None
+    # Client-side request budget: at most max_rate calls every time_period seconds
+    rate_limit = (60, 60)
+    # Seconds to wait on the provider's API before giving up on a call
+    http_timeout = HTTP_TIMEOUT
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        # Sent with every API call made through http_client
+        self._headers = {"Authorization": f"Bearer {api_key}",
+                         "Content-Type": "application/json"}
+        self._http_client = None
+        self._http_client_loop = None
+        self._limiter = AsyncLimiter(*self.rate_limit)
+        self._retry_at = 0.0
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        Pooled HTTP client shared by every request of this provider.
+
+        The client is created on first use and kept alive, so consecutive
+        requests reuse open connections instead of performing a new
+        TCP/TLS handshake each time.
+
+        :return: httpx.AsyncClient
+            The provider's HTTP client.
+        """
+        # Pooled connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if (self._http_client is None or self._http_client.is_closed
+                or self._http_client_loop is not loop):
+            self._http_client = httpx.AsyncClient(base_url=self.base_url or "",
+                                                  headers=self._headers,
+                                                  limits=HTTP_LIMITS,
+                                                  timeout=self.http_timeout)
+            self._http_client_loop = loop
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """
+        Closes the provider's HTTP client, if one was opened.
+        """
+        if (self._http_client is not None and not self._http_client.is_closed
+                and self._http_client_loop is asyncio.get_running_loop()):
+            await self._http_client.aclose()
+        self._http_client = None
+        self._http_client_loop = None
+
+    @asynccontextmanager
+    async def _api_call(self):
+        """
+        Waits until the provider's API may be called and holds a request slot for the call.
+
+        Honours any pause requested by the server, then takes a slot from
+        the provider's rate limiter and from the shared request semaphore.
+        """
+        pause = self._retry_at - time.monotonic()
+        if pause > 0:
+            logger.info(f"Rate limited by {type(self).__name__}, waiting {pause:.1f}s.")
+            await asyncio.sleep(pause)
+        await self._limiter.acquire()
+        async with request_slots():
+            yield
+
+    def _observe_rate_limit(self, response: httpx.Response) -> None:
+        """
+        Adjusts the pause before the next call from the response's rate limit headers.
+
+        :param response: httpx.Response
+            The response returned by the provider's API.
+        """
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            pause = float(retry_after)
+        elif response.headers.get("X-RateLimit-Remaining") == "0":
+            pause = self._limiter.time_period / self._limiter.max_rate
+        else:
+            return
+        self._retry_at = max(self._retry_at, time.monotonic() + pause)
 
     @abstractmethod
     async def request(self, prompt, output_path, **kwargs):
@@ -0,0 +1,4 @@
+from .elevenlabs import ElevenLabsProvider
+from .minimax import MinimaxProvider
+from .openrouter import OpenRouterProvider
+from .runware import RunwareProvider
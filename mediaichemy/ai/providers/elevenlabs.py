@@ -1,11 +1,31 @@
+import asyncio
 import logging
 from mediaichemy.ai.provider import Provider
 import os
 from elevenlabs import ElevenLabs, VoiceSettings
-from mediaichemy.configs import ConfigManager
+from mediaichemy.configs import get_config_manager
 
 logger = logging.getLogger(__name__)
 
+# Speech at 32 kbps is about 4 KB per second, so a minute of it fits in the buffer
+AUDIO_WRITE_BUFFER = 1 << 20
+
+
+def _save_audio_stream(response, output_path: str) -> None:
+    """
+    Writes an audio stream to a file.
+
+    The chunks go through a buffer large enough for a whole speech track,
+    so the small chunks of the stream do not each cost a system call.
+
+    :param response: Iterator[bytes]
+        The audio stream returned by the ElevenLabs client.
+    :param output_path: str
+        The file path where the audio will be saved.
+    """
+    with open(output_path, "wb", buffering=AUDIO_WRITE_BUFFER) as f:
+        f.writelines(response)
+
 
 class ElevenLabsProvider(Provider):
     """
@@ -14,6 +34,8 @@ class ElevenLabsProvider(Provider):
     :ivar api_key: str
         The API key for the ElevenLabs API.
     """
+    __slots__ = ("client", "voice_id", "voice_settings")
+
     def __init__(self):
         """
         Initializes the ElevenLabsProvider.
@@ -21,11 +43,15 @@ class ElevenLabsProvider(Provider):
         :raises EnvironmentError:
             If no API key is found in the configs or the ELEVENLABS_API_KEY environment variable.
         """
-        api_key = ConfigManager().get("ai.speech.elevenlabs.api_key") or os.getenv("ELEVENLABS_API_KEY")
+        config_manager = get_config_manager()
+        api_key = config_manager.get("ai.speech.elevenlabs.api_key") or os.getenv("ELEVENLABS_API_KEY")
         if not api_key:
             raise EnvironmentError("No API key found in configs or ELEVENLABS_API_KEY environment variable.")
         super().__init__(api_key)
         self.client = ElevenLabs(api_key=api_key)
+        self.voice_id = config_manager.get("ai.speech.elevenlabs.voice_id")
+        # Built once, since the settings are the same for every request
+        self.voice_settings = VoiceSettings(**config_manager.get(table="ai.speech.elevenlabs.voice_settings"))
 
     async def request(self, prompt: str, output_path) -> str:
         """
@@ -44,10 +70,32 @@ class ElevenLabsProvider(Provider):
         :return: str
             The file path where the audio file has been saved.
         """
-        config_manager = ConfigManager()
-        voice_id = config_manager.get("ai.speech.elevenlabs.voice_id")
-        voice_settings = config_manager.get(table="ai.speech.elevenlabs.voice_settings")
-        logger.debug(f"Voice settings: {voice_settings}")
+        logger.debug(f"Voice settings: {self.voice_settings}")
+        # The ElevenLabs client is synchronous, so synthesis runs in a worker thread
+        async with self._api_call():
+            await asyncio.to_thread(self._synthesize, prompt, output_path,
+                                    self.voice_id, self.voice_settings)
+        logger.info(f"Audio saved to {output_path}")
+
+        # Return the path of the saved audio file
+        return output_path
+
+    def _synthesize(self, prompt: str, output_path: str,
+                    voice_id: str, voice_settings: VoiceSettings) -> None:
+        """
+        Calls the text-to-speech API and streams the audio into a file.
+
+        This is blocking and meant to be run outside the event loop.
+
+        :param prompt: str
+            The text content to convert to speech.
+        :param output_path: str
+            The file path where the audio file will be saved.
+        :param voice_id: str
+            The ElevenLabs voice to use.
+        :param voice_settings: VoiceSettings
+            The settings of the voice.
+        """
         # Calling the text_to_speech conversion API with detailed parameters
         response = self.client.text_to_speech.convert(
             voice_id=voice_id,
@@ -55,17 +103,6 @@ class ElevenLabsProvider(Provider):
             output_format="mp3_22050_32",
             text=prompt,
             model_id="eleven_multilingual_v2",
-            voice_settings=VoiceSettings(
-                **voice_settings
-            ),
+            voice_settings=voice_settings,
         )
-
-        # Save the audio stream to a file
-        with open(output_path, "wb") as f:
-            for chunk in response:
-                if chunk:
-                    f.write(chunk)
-        logger.info(f"Audio saved to {output_path}")
-
-        # Return the path of the saved audio file
-        return output_path
+        _save_audio_stream(response, output_path)
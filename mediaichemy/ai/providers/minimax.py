@@ -1,14 +1,41 @@
 import httpx
 import logging
-from mediaichemy.ai.provider import Provider
+import orjson
+from mediaichemy.ai.provider import Provider, request_slots
 import asyncio
 import base64
+import mmap
 import os
+import random
 from mediaichemy.tools.filehandling import MP4File
-from mediaichemy.configs import ConfigManager
+from mediaichemy.configs import get_config_manager
 
 logger = logging.getLogger(__name__)
 
+# Status polling starts fast and backs off exponentially, with jitter, up to the cap
+POLL_INITIAL_DELAY = 2.0
+POLL_MAX_DELAY = 30.0
+POLL_BACKOFF = 1.5
+POLL_JITTER = 0.1
+
+
+def _encode_image(img_filepath: str) -> str:
+    """
+    Encodes a JPEG image as a base64 data URI.
+
+    The file is memory-mapped and encoded straight from the mapping,
+    so no intermediate copy of the raw image is read into memory.
+
+    :param img_filepath: str
+        The path to the image file.
+    :return: str
+        The image as a ``data:image/jpeg;base64,...`` URI.
+    """
+    with open(img_filepath, "rb") as image_file, \
+            mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as image:
+        data = base64.b64encode(image)
+    return (b"data:image/jpeg;base64," + data).decode("ascii")
+
 
 class MinimaxProvider(Provider):
     """
@@ -17,6 +44,10 @@ class MinimaxProvider(Provider):
     :ivar api_key: str
         The API key for the Minimax API.
     """
+    __slots__ = ("model",)
+    base_url = "https://api.minimaxi.chat/v1"
+    rate_limit = (30, 60)
+
     def __init__(self):
         """
         Initializes the MinimaxProvider.
@@ -24,11 +55,12 @@ class MinimaxProvider(Provider):
         :raises EnvironmentError:
             If no API key is found in the configs or the MINIMAX_API_KEY environment variable.
         """
-        api_key = ConfigManager().get("ai.video.minimax.api_key") or os.getenv("MINIMAX_API_KEY")
+        config_manager = get_config_manager()
+        api_key = config_manager.get("ai.video.minimax.api_key") or os.getenv("MINIMAX_API_KEY")
         if not api_key:
             raise EnvironmentError("No API key found in configs or MINIMAX_API_KEY environment variable.")
         super().__init__(api_key)
-        self.base_url = "https://api.minimaxi.chat/v1"
+        self.model = config_manager.get("ai.video.minimax.model")
 
     async def request(self,
                       prompt: str, input_path: str,
@@ -47,11 +79,10 @@ class MinimaxProvider(Provider):
         :raises Exception:
             If the video generation task fails.
         """
-        model = ConfigManager().get('ai.video.minimax.model')
         logger.info(
-            f"Preparing video generation request with model '{model}'.")
+            f"Preparing video generation request with model '{self.model}'.")
         # Prepare the payload
-        payload = self._prepare_payload(input_path, prompt, model)
+        payload = await asyncio.to_thread(self._prepare_payload, input_path, prompt, self.model)
         logger.debug(f"Payload: {payload}")
         logger.info("Submitting video generation task to Minimax.")
         # Submit the task
@@ -78,12 +109,10 @@ class MinimaxProvider(Provider):
         :return: dict
             The payload for the video generation request.
         """
-        with open(img_filepath, "rb") as image_file:
-            data = base64.b64encode(image_file.read()).decode("utf-8")
         return {
             "model": model,
             "prompt": img_prompt,
-            "first_frame_image": f"data:image/jpeg;base64,{data}"
+            "first_frame_image": _encode_image(img_filepath)
         }
 
     async def _submit_task(self, payload: dict) -> str:
@@ -97,13 +126,11 @@ class MinimaxProvider(Provider):
         :raises httpx.HTTPStatusError:
             If the HTTP request fails.
         """
-        headers = {"authorization": f"Bearer {self.api_key}",
-                   "Content-Type": "application/json"}
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{self.base_url}/video_generation",
-                                         headers=headers, json=payload)
-            response.raise_for_status()
-            return response.json().get("task_id")
+        async with self._api_call():
+            response = await self.http_client.post("/video_generation", json=payload)
+        self._observe_rate_limit(response)
+        response.raise_for_status()
+        return orjson.loads(response.content).get("task_id")
 
     async def _poll_and_download(self,
                                  task_id: str,
@@ -121,14 +148,26 @@ class MinimaxProvider(Provider):
             If the video generation fails.
         """
         logger.info(f"Polling status for task ID: {task_id}")
+        delay = POLL_INITIAL_DELAY
         while True:
-            await asyncio.sleep(30)
-            file_id, status = await self.check_status(task_id)
+            await asyncio.sleep(delay + random.uniform(0, delay * POLL_JITTER))
+            delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+            try:
+                file_id, status = await self.check_status(task_id)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 429:
+                    raise
+                # Rate limited: wait as long as the server asks before polling again
+                retry_after = e.response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else POLL_MAX_DELAY
+                logger.warning(f"Polling rate limited. Retrying in {delay}s.")
+                continue
             if file_id:
                 logger.info(
                     f"Task completed. Downloading video to {output_path}.")
                 download_url = await self.get_download_url(file_id)
-                MP4File._download_file(download_url, output_path)
+                async with request_slots():
+                    await MP4File._adownload_file(download_url, output_path, client=self.http_client)
                 return output_path
             if status in {"Fail", "Unknown"}:
                 logger.error("Video generation failed.")
@@ -145,14 +184,12 @@ class MinimaxProvider(Provider):
         :raises httpx.HTTPStatusError:
             If the HTTP request fails.
         """
-        headers = {"authorization": f"Bearer {self.api_key}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/query/video_generation?task_id={task_id}",
-                headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("file_id", ""), data.get("status", "Unknown")
+        async with self._api_call():
+            response = await self.http_client.get(f"/query/video_generation?task_id={task_id}")
+        self._observe_rate_limit(response)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        return data.get("file_id", ""), data.get("status", "Unknown")
 
     async def get_download_url(self, file_id: str) -> str:
         """
@@ -165,12 +202,10 @@ class MinimaxProvider(Provider):
         :raises httpx.HTTPStatusError:
             If the HTTP request fails.
         """
-        headers = {"authorization": f"Bearer {self.api_key}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/files/retrieve?file_id={file_id}",
-                headers=headers)
-            response.raise_for_status()
-            download_url = response.json()["file"]["download_url"]
-            logger.info(f"Video available at URL: {download_url}")
-            return download_url
+        async with self._api_call():
+            response = await self.http_client.get(f"/files/retrieve?file_id={file_id}")
+        self._observe_rate_limit(response)
+        response.raise_for_status()
+        download_url = orjson.loads(response.content)["file"]["download_url"]
+        logger.info(f"Video available at URL: {download_url}")
+        return download_url
@@ -1,8 +1,9 @@
 import httpx
 import logging
+import orjson
 from mediaichemy.ai.provider import Provider
 import os
-from mediaichemy.configs import ConfigManager
+from mediaichemy.configs import get_config_manager
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,12 @@ class OpenRouterProvider(Provider):
     :ivar api_key: str
         The API key for the OpenRouter API.
     """
+    __slots__ = ("model", "model_dicts")
+    base_url = "https://openrouter.ai/api/v1"
+    rate_limit = (20, 60)
+    # A completion is only sent once fully generated, which can take longer than other calls
+    http_timeout = 60.0
+
     def __init__(self):
         """
         Initializes the OpenRouterProvider.
@@ -21,12 +28,13 @@ class OpenRouterProvider(Provider):
         :raises EnvironmentError:
             If no API key is found in the configs or the OPENROUTER_API_KEY environment variable.
         """
-        api_key = ConfigManager().get("ai.text.openrouter.api_key") or os.getenv("OPENROUTER_API_KEY")
+        config_manager = get_config_manager()
+        api_key = config_manager.get("ai.text.openrouter.api_key") or os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             raise EnvironmentError("No API key found in configs or OPENROUTER_API_KEY environment variable.")
         super().__init__(api_key)
+        self.model = config_manager.get("ai.text.openrouter.model")
         self.model_dicts = {'auto': 'openrouter/auto', 'deepseek': 'deepseek/deepseekr1'}
-        self.base_url = "https://openrouter.ai/api/v1"
 
     async def request(self, prompt: str, output_path=None,) -> str:
         """
@@ -42,26 +50,22 @@ class OpenRouterProvider(Provider):
         if output_path:
             raise ValueError("Output path is not yet supported for text generation.")
 
-        model = ConfigManager().get("ai.text.openrouter.model")
         logger.info("Sending text generation"
-                    f" request to OpenRouter with model '{model}'")
+                    f" request to OpenRouter with model '{self.model}'")
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
+            async with self._api_call():
+                response = await self.http_client.post(
+                    "/chat/completions",
                     json={
-                        "model": self.model_dicts[model],
+                        "model": self.model_dicts[self.model],
                         "messages": [{"role": "user", "content": prompt}]
                     }
                 )
-                response.raise_for_status()
-                completion = response.json()
-                logger.info("Text generation request completed successfully.")
-                return completion["choices"][0]["message"]["content"]
+            self._observe_rate_limit(response)
+            response.raise_for_status()
+            completion = orjson.loads(response.content)
+            logger.info("Text generation request completed successfully.")
+            return completion["choices"][0]["message"]["content"]
         except httpx.HTTPStatusError as e:
             logger.error("HTTP error occurred:"
                          f" {e.response.status_code} - {e.response.text}")
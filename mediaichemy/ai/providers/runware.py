@@ -1,9 +1,10 @@
+import asyncio
 import logging
-from mediaichemy.ai.provider import Provider
+from mediaichemy.ai.provider import Provider, request_slots
 from runware import Runware, IImageInference
 import os
 from mediaichemy.tools.filehandling import JPEGFile
-from mediaichemy.configs import ConfigManager
+from mediaichemy.configs import get_config_manager
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,8 @@ class RunwareProvider(Provider):
     :ivar api_key: str
         The API key for the Runware API.
     """
+    __slots__ = ("configs", "model", "_client", "_client_lock", "_client_loop")
+
     def __init__(self):
         """
         Initializes the RunwareProvider.
@@ -22,10 +25,18 @@ class RunwareProvider(Provider):
         :raises EnvironmentError:
             If no API key is found in the configs or the RUNWARE_API_KEY environment variable.
         """
-        api_key = ConfigManager().get("ai.image.runware.api_key") or os.getenv("RUNWARE_API_KEY")
+        config_manager = get_config_manager()
+        api_key = config_manager.get("ai.image.runware.api_key") or os.getenv("RUNWARE_API_KEY")
         if not api_key:
             raise EnvironmentError("No API key found in configs or RUNWARE_API_KEY environment variable.")
         super().__init__(api_key)
+        # Copy the table so popping keys never mutates the shared configuration
+        self.configs = dict(config_manager.get("ai.image.runware"))
+        self.configs.pop("api_key", None)
+        self.model = self.configs.pop("model")
+        self._client = None
+        self._client_lock = None
+        self._client_loop = None
 
     async def request(self, prompt: str,
                       output_path: str = "image.jpg") -> str:
@@ -39,32 +50,100 @@ class RunwareProvider(Provider):
         :return: JPEGFile
             The generated image file.
         """
-        logger.info("Connecting to Runware API for image generation.")
-        client = Runware(api_key=self.api_key)
-        await client.connect()
+        client = await self._get_client()
 
         logger.info("Building inference for image generation.")
         inference = self.build_inference(prompt)
-        images = await client.imageInference(requestImage=inference)
+        try:
+            async with self._api_call():
+                images = await client.imageInference(requestImage=inference)
+        except Exception:
+            # Drop the connection so the next request starts from a fresh one
+            self._client = None
+            raise
         image_url = images[0].imageURL
 
         logger.info(f"Downloading generated image to {output_path}.")
-        JPEGFile._download_file(image_url, output_path)
+        async with request_slots():
+            await JPEGFile._adownload_file(image_url, output_path, client=self.http_client)
         return output_path
 
-    def build_inference(self, prompt: str) -> IImageInference:
+    async def request_batch(self, prompt: str, n: int,
+                            output_dir: str = ".") -> list[str]:
+        """
+        Requests several images for the same prompt in a single inference.
+
+        The images are generated by one Runware task and then downloaded
+        concurrently.
+
+        :param prompt: str
+            The text prompt.
+        :param n: int
+            The number of images to generate.
+        :param output_dir: str
+            The directory where the images are saved as image_<i>.jpg.
+        :return: list[str]
+            The paths of the generated images.
+        """
+        if n <= 0:
+            raise ValueError("The number of images must be greater than 0.")
+        client = await self._get_client()
+
+        logger.info(f"Building inference for {n} images.")
+        inference = self.build_inference(prompt, number_results=n)
+        try:
+            async with self._api_call():
+                images = await client.imageInference(requestImage=inference)
+        except Exception:
+            self._client = None
+            raise
+
+        async def download(image_url: str, output_path: str) -> None:
+            async with request_slots():
+                await JPEGFile._adownload_file(image_url, output_path, client=self.http_client)
+
+        output_paths = [os.path.join(output_dir, f"image_{i}.jpg") for i in range(len(images))]
+        logger.info(f"Downloading {len(images)} generated images to {output_dir}.")
+        # A failed download cancels the remaining ones instead of letting them run on
+        async with asyncio.TaskGroup() as group:
+            for image, path in zip(images, output_paths):
+                group.create_task(download(image.imageURL, path))
+        return output_paths
+
+    async def _get_client(self) -> Runware:
+        """
+        Returns a connected Runware client, connecting only when needed.
+
+        The WebSocket connection is kept open and shared by all requests
+        made through this provider.
+
+        :return: Runware
+            The connected client.
+        """
+        # The WebSocket and lock belong to the loop they were created on
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            self._client, self._client_lock, self._client_loop = None, asyncio.Lock(), loop
+        async with self._client_lock:
+            if self._client is None or not self._client.connected():
+                logger.info("Connecting to Runware API for image generation.")
+                client = Runware(api_key=self.api_key)
+                await client.connect()
+                self._client = client
+        return self._client
+
+    def build_inference(self, prompt: str, number_results: int = 1) -> IImageInference:
         """
         Builds the IImageInference object for image generation.
 
         :param prompt: str
             The text prompt.
+        :param number_results: int
+            The number of images to generate.
         :return: IImageInference
             The inference object.
         """
-        config_manager = ConfigManager()
-        model = config_manager.get("ai.image.runware").pop("model"),
-        config_manager.get("ai.image.runware").pop("api_key")
         return IImageInference(positivePrompt=prompt,
-                               numberResults=1,
-                               model=model,
-                               **config_manager.get("ai.image.runware"))
+                               numberResults=number_results,
+                               model=self.model,
+                               **self.configs)
@@ -1,8 +1,8 @@
-from mediaichemy.ai.providers.elevenlabs import ElevenLabsProvider
-from mediaichemy.ai.providers.openrouter import OpenRouterProvider
-from mediaichemy.ai.providers.runware import RunwareProvider
-from mediaichemy.ai.providers.minimax import MinimaxProvider
-from mediaichemy.configs import ConfigManager
+import asyncio
+from mediaichemy.ai.providers import (ElevenLabsProvider, MinimaxProvider,
+                                      OpenRouterProvider, RunwareProvider)
+from mediaichemy.ai.provider import Provider
+from mediaichemy.configs import get_config_manager
 import logging
 from mediaichemy.tools.filehandling import JPEGFile, MP3File, MP4File
 import os
@@ -10,10 +10,10 @@ import os
 logger = logging.getLogger(__name__)
 
 PROVIDERS = {
-    "text": {"openrouter": OpenRouterProvider},
-    "image": {"runware": RunwareProvider},
-    "video": {"minimax": MinimaxProvider},
-    "speech": {"elevenlabs": ElevenLabsProvider},
+    ("text", "openrouter"): OpenRouterProvider,
+    ("image", "runware"): RunwareProvider,
+    ("video", "minimax"): MinimaxProvider,
+    ("speech", "elevenlabs"): ElevenLabsProvider,
 }
 
 
@@ -24,11 +24,119 @@ TYPES = {
     "speech": MP3File,
 }
 
+# Provider instances are kept alive so their connections are reused across requests
+_PROVIDER_INSTANCES = {}
+# The configuration the cached providers read their API keys and models from
+_providers_config = None
+# Providers replaced after a configuration reload, closed with the others
+_STALE_PROVIDERS = []
+
+
+def _get_provider(media: str, provider_name: str) -> Provider:
+    """
+    Returns the provider for a media type, instantiating it on first use.
+
+    Providers read their settings when created, so they are created again
+    whenever the configuration is reloaded.
+
+    :param media: str
+        The type of media to generate (e.g., "text", "image").
+    :param provider_name: str
+        The name of the provider (e.g., "openrouter").
+    :return: Provider
+        The cached provider instance.
+    :raises ValueError:
+        If the provider is not supported for the media type.
+    """
+    global _providers_config
+    config_manager = get_config_manager()
+    if config_manager is not _providers_config:
+        # Requests may still be using the old providers, so they are only closed later
+        _STALE_PROVIDERS.extend(_PROVIDER_INSTANCES.values())
+        _PROVIDER_INSTANCES.clear()
+        _providers_config = config_manager
+    key = (media, provider_name)
+    provider = _PROVIDER_INSTANCES.get(key)
+    if provider is None:
+        provider_class = PROVIDERS.get(key)
+        if provider_class is None:
+            raise ValueError(f"Provider '{provider_name}' is not supported.")
+        provider = _PROVIDER_INSTANCES[key] = provider_class()
+    return provider
+
+
+async def close_providers() -> None:
+    """
+    Closes the connections of every cached provider and forgets them.
+    """
+    providers = [*_PROVIDER_INSTANCES.values(), *_STALE_PROVIDERS]
+    _PROVIDER_INSTANCES.clear()
+    _STALE_PROVIDERS.clear()
+    for provider in providers:
+        await provider.aclose()
+
+
+# Requests currently being processed, shared by identical concurrent calls
+_INFLIGHT_REQUESTS = {}
+
 
 async def ai_request(media: str, prompt, output_path=None, **kwargs):
     """
     Unified interface to make a request to a provider.
 
+    Identical requests made while one is still in flight share its result
+    instead of calling the provider again. Requests with unhashable
+    arguments, such as lists or dicts, are never shared.
+
+    :param media: str
+        The type of media to generate (e.g., "text", "image").
+    :param prompt: str
+        The prompt for the AI provider.
+    :param kwargs: dict
+        Additional arguments for the provider's request method.
+    :return: Any
+        The result of the provider's request.
+    """
+    key = (media, prompt, output_path, tuple(sorted(kwargs.items())))
+    try:
+        inflight = _INFLIGHT_REQUESTS.get(key)
+    except TypeError:
+        return await _ai_request(media, prompt, output_path, **kwargs)
+    if inflight is None:
+        task = asyncio.ensure_future(_ai_request(media, prompt, output_path, **kwargs))
+        inflight = _INFLIGHT_REQUESTS[key] = [task, 0]
+        task.add_done_callback(lambda _: _INFLIGHT_REQUESTS.pop(key, None))
+    inflight[1] += 1
+    try:
+        # Shielded so one caller giving up does not cancel the request for the others
+        return await asyncio.shield(inflight[0])
+    except asyncio.CancelledError:
+        if inflight[1] == 1:
+            inflight[0].cancel()
+        raise
+    finally:
+        inflight[1] -= 1
+
+
+async def gather_media(requests: list[dict]) -> list:
+    """
+    Makes several independent requests concurrently.
+
+    Requests that depend on each other's results, such as a video made
+    from a generated image, must still be awaited one after the other.
+
+    :param requests: list[dict]
+        The keyword arguments of each ai_request call.
+    :return: list
+        The results, in the order of the requests.
+    """
+    return await asyncio.gather(*(ai_request(**request) for request in requests))
+
+
+async def _ai_request(media: str, prompt, output_path=None, **kwargs):
+    """
+    Makes a request to the configured provider for a media type.
+
     :param media: str
         The type of media to generate (e.g., "text", "image").
     :param prompt: str
@@ -38,15 +146,11 @@ async def ai_request(media: str, prompt, output_path=None, **kwargs):
     :return: Any
         The result of the provider's request.
     """
-    config_manager = ConfigManager()
+    config_manager = get_config_manager()
     provider_name = config_manager.get(table=f'ai.{media}', key='provider')
     logger.debug(f"Using provider '{provider_name}' for media '{media}'")
     logger.debug(f"Arguments: {kwargs}")
-    if provider_name not in PROVIDERS[media]:
-        raise ValueError(f"Provider '{provider_name}' is not supported.")
-
-    # Instantiate the provider using the factory pattern
-    provider = PROVIDERS[media][provider_name]()
+    provider = _get_provider(media, provider_name)
 
     response = await provider.request(prompt, output_path=output_path, **kwargs)
 
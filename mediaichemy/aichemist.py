@@ -8,6 +8,8 @@ CONTENT = {
                     'content': MusicVideo}
 }
 
+CONTENT_TYPES = frozenset(CONTENT)
+
 
 class mediaAIChemist:
     def __init__(self, content_type: str):
@@ -16,9 +18,10 @@ class mediaAIChemist:
         :param content_type: str
             The type of content to be created (e.g., "short_video").
         """
-        if content_type not in CONTENT:
+        if content_type not in CONTENT_TYPES:
             raise ValueError(f"Unsupported content type: {content_type}")
         self.content_type = content_type
+        self.content_class = CONTENT[content_type]['content']
         self.content_creator = CONTENT[content_type]['creator']()
 
     async def generate_ideas(self):
@@ -37,7 +40,7 @@ class mediaAIChemist:
             The idea to be used for content creation.
         :return: None
         """
-        content = CONTENT[self.content_type]['content'](idea)
+        content = self.content_class(idea)
         return content
 
     async def create_content(self, content, purge: bool = False) -> None:
@@ -53,3 +56,19 @@ class mediaAIChemist:
         if purge:
             content.purge()
         return media
+
+    async def create_contents(self, contents: list, purge: bool = False) -> list:
+        """
+        Create several contents concurrently.
+        :param contents: list
+            The contents to be created.
+        :param purge: bool
+            Whether to clean up the content creation files after completion.
+        :return: list
+            The created media, in the order of the contents.
+        """
+        media = await self.content_creator.create_batch(contents)
+        if purge:
+            for content in contents:
+                content.purge()
+        return media
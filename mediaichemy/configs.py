@@ -1,10 +1,37 @@
+import copy
 import os
-import toml
+import tomllib
 from typing import Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "default_configs.toml")
+
+# Parsed TOML files by path, along with the (mtime, size) they were parsed at
+_parsed_files = {}
+
+
+def _read_toml(path: str) -> dict:
+    """
+    Parse a TOML file, reusing the previous result while the file is unchanged.
+
+    :param path: str
+        Path to the TOML file.
+
+    :returns: dict
+        A copy of the parsed data, safe for the caller to modify.
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed_files.get(path)
+    if cached is None or cached[0] != key:
+        # One binary read; tomllib decodes the whole buffer at once
+        with open(path, 'rb') as file:
+            data = file.read()
+        cached = _parsed_files[path] = (key, tomllib.loads(data.decode('utf-8')))
+    return copy.deepcopy(cached[1])
+
 
 class ConfigManager:
     """
@@ -17,14 +44,20 @@ class ConfigManager:
     :ivar config: dict
         Merged configuration settings.
     """
-    def __init__(self):
+    def __init__(self, config_file_path: str = None):
         """
         Initialize the ConfigManager by searching for the "configs.toml" file
         in the caller's directory and loading default configurations.
+
+        :param config_file_path: str, optional
+            Path to a configuration file already known to exist,
+            which skips the search.
         """
-        self.config_file_path = self._find_config_file()
+        self.config_file_path = config_file_path or self._find_config_file()
         self.defaults = self._load_default_configs()
         self.config = self._load_config()
+        # Every table and value by its dotted path, so lookups need no traversal
+        self._flat = self._flatten(self.config)
 
     def _find_config_file(self) -> str:
         """
@@ -44,8 +77,7 @@ class ConfigManager:
                 "Falling back to 'default_configs.toml'.",
                 caller_directory
             )
-            return os.path.join(os.path.dirname(__file__),
-                                "default_configs.toml")
+            return DEFAULT_CONFIG_PATH
         return config_file_path
 
     def _load_config(self) -> dict:
@@ -57,17 +89,22 @@ class ConfigManager:
             Merged configuration data, prioritizing
             values from the config file.
         """
-        with open(self.config_file_path, 'r') as file:
-            user_config = toml.load(file)
+        # Without a user file the defaults are the whole configuration
+        if self.config_file_path == DEFAULT_CONFIG_PATH:
+            return copy.deepcopy(self.defaults)
+        user_config = _read_toml(self.config_file_path)
 
         # Merge user_config into defaults, prioritizing user_config values
         return self._merge_dicts(self.defaults, user_config)
 
     def _merge_dicts(self, base: dict, override: dict) -> dict:
         """
-        Recursively merge two dictionaries, prioritizing values
+        Merge two dictionaries, prioritizing values
         from the override dictionary.
 
+        Nested tables are merged in place on a single deep copy of
+        the base dictionary, walking them with an explicit stack.
+
         :param base: dict
             The base dictionary (e.g., defaults).
         :param override: dict
@@ -76,14 +113,16 @@ class ConfigManager:
         :returns: dict
             The merged dictionary.
         """
-        merged = base.copy()
-        for key, value in override.items():
-            if isinstance(value,
-                          dict) and key in merged and isinstance(merged[key],
-                                                                 dict):
-                merged[key] = self._merge_dicts(merged[key], value)
-            else:
-                merged[key] = value
+        merged = copy.deepcopy(base)
+        stack = [(merged, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(value, dict) and isinstance(current, dict):
+                    stack.append((current, value))
+                else:
+                    target[key] = value
         return merged
 
     def _load_default_configs(self) -> dict:
@@ -96,13 +135,32 @@ class ConfigManager:
         :raises FileNotFoundError:
             If the "default_configs.toml" file is not found.
         """
-        default_config_path = os.path.join(os.path.dirname(__file__),
-                                           "default_configs.toml")
-        if not os.path.exists(default_config_path):
+        try:
+            return _read_toml(DEFAULT_CONFIG_PATH)
+        except FileNotFoundError:
             raise FileNotFoundError("'default_configs.toml' not found in"
-                                    f" directory: {os.path.dirname(__file__)}")
-        with open(default_config_path, 'r') as file:
-            return toml.load(file)
+                                    f" directory: {os.path.dirname(__file__)}") from None
+
+    def _flatten(self, config: dict) -> dict:
+        """
+        Map every table and value in the configuration to its dotted path.
+
+        :param config: dict
+            The configuration to flatten.
+
+        :returns: dict
+            The tables and values keyed by path (e.g. "ai.text.provider").
+        """
+        flat = {}
+        stack = [('', config)]
+        while stack:
+            prefix, table = stack.pop()
+            for key, value in table.items():
+                path = prefix + key
+                flat[path] = value
+                if isinstance(value, dict):
+                    stack.append((path + '.', value))
+        return flat
 
     def _resolve_keys(self, table: str = None, key: str = None) -> list:
         """
@@ -148,18 +206,14 @@ class ConfigManager:
         :param table: str
             The name of the table to apply defaults to.
         """
-        keys = table.split('.')
         table_ref = self.config
-        for key in keys:
-            if key not in table_ref:
-                table_ref[key] = {}
-            table_ref = table_ref[key]
+        for key in table.split('.'):
+            table_ref = table_ref.setdefault(key, {})
 
         defaults = self.defaults.get(table)
         if defaults:
             for k, v in defaults.items():
-                if k not in table_ref:
-                    table_ref[k] = v
+                table_ref.setdefault(k, v)
 
     def get(self, table: str = None, key: str = None) -> Any:
         """
@@ -179,13 +233,62 @@ class ConfigManager:
             A dictionary of key-value pairs if a table is requested,
             or a specific value if a key is requested.
         """
+        if table is None:
+            path = key
+        else:
+            path = f"{table}.{key}" if key else table
+        result = self._flat.get(path)
+        if result is not None:
+            return result
+
+        # Missing tables are created with their defaults, so they are looked up the long way
         if table:
             self._apply_defaults(table)
 
         keys = self._resolve_keys(table, key)
         result = self._traverse_config(keys)
-
-        if key is None and isinstance(result, dict):
-            return result
+        self._flat[path] = result
 
         return result
+
+
+_shared_manager = None
+_shared_manager_key = None
+
+
+def _config_file_key() -> tuple:
+    """
+    Identify the current state of the "configs.toml" file in the working directory.
+
+    :returns: tuple
+        The file path, modification time and size, or ``(None,)``
+        if there is no such file.
+    """
+    config_file_path = os.path.join(os.getcwd(), "configs.toml")
+    try:
+        stat = os.stat(config_file_path)
+    except FileNotFoundError:
+        return (None,)
+    return config_file_path, stat.st_mtime_ns, stat.st_size
+
+
+def get_config_manager() -> ConfigManager:
+    """
+    Return the shared ConfigManager, reloading it only when "configs.toml" changes.
+
+    :returns: ConfigManager
+        The configuration manager for the current configuration file.
+    """
+    global _shared_manager, _shared_manager_key
+    key = _config_file_key()
+    if _shared_manager is None or key != _shared_manager_key:
+        # The key already tells whether configs.toml exists, so it is not searched for again
+        if key[0] is None:
+            logger.warning(
+                "'configs.toml' not found in directory: %s. "
+                "Falling back to 'default_configs.toml'.",
+                os.getcwd()
+            )
+        _shared_manager = ConfigManager(config_file_path=key[0] or DEFAULT_CONFIG_PATH)
+        _shared_manager_key = key
+    return _shared_manager
@@ -1,6 +1,7 @@
 import asyncio
 from functools import wraps
 import logging
+import os
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -18,49 +19,105 @@ def checkpoint(state):
         The name of the state to update in the content object.
     """
     def decorator(func):
-        @wraps(func)
-        async def async_handler(content, *args, **kwargs):
-            return await _handle_checkpoint(func, content, state, *args, **kwargs)
+        # Whether func is a coroutine function is known here, so each handler only does its own kind of call
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_handler(content, *args, **kwargs):
+                return await _handle_checkpoint_async(func, content, state, *args, **kwargs)
+            return async_handler
 
         @wraps(func)
         def sync_handler(content, *args, **kwargs):
-            return _handle_checkpoint(func, content, state, *args, **kwargs)
-
-        # Return the appropriate handler based on whether the function is a coroutine
-        return async_handler if asyncio.iscoroutinefunction(func) else sync_handler
+            return _handle_checkpoint_sync(func, content, state, *args, **kwargs)
+        return sync_handler
 
     return decorator
 
 
-async def _handle_checkpoint(func, content, state, *args, **kwargs):
+def checkpoint_reached(content, state) -> bool:
+    """
+    Check whether the content has already reached a checkpoint.
+
+    :param content: object
+        The content object with a `state` and `STATES` attribute.
+    :param state: str
+        The name of the state to check.
+    :return: bool
+        True if the content's current state is at or past the given state.
     """
-    Handle the checkpoint logic for both sync and async functions.
+    return content.STATES[content.state][0] >= content.STATES[state][0]
+
+
+def _should_skip(func, content, state) -> bool:
+    """
+    Check whether a checkpointed method can be skipped, logging it if so.
 
     :param func: callable
         The function being decorated.
     :param content: object
         The content object with a `state` and `STATES` attribute.
     :param state: str
-        The name of the state to update.
-    :return: Any
-        The result of the function execution or the return value of the skipped state.
+        The name of the state the function leads to.
+    :return: bool
+        True if the checkpoint has already been reached.
     """
-    # Check if the checkpoint has already been reached
-    has_checkpoint_been_reached = content.STATES[content.state][0] >= content.STATES[state][0]
-    if has_checkpoint_been_reached:
+    if checkpoint_reached(content, state):
         logger.warning(f"Skipping {func.__name__}: Checkpoint '{state}' has already been reached.")
-        return content.STATES[state][1]
+        return True
+    return False
+
 
-    # Execute the method
-    if asyncio.iscoroutinefunction(func):
-        result = await func(content, *args, **kwargs)
-    else:
-        result = func(content, *args, **kwargs)
+def _complete_checkpoint(content, state) -> None:
+    """
+    Move the content to a reached checkpoint and save it.
 
-    # Update the state after the method execution
+    :param content: object
+        The content object with a `state` attribute.
+    :param state: str
+        The name of the state to update.
+    """
     content.state = state
     logger.info(f"Content state updated: {content.state}")
     _save_state(content)
+
+
+def _handle_checkpoint_sync(func, content, state, *args, **kwargs):
+    """
+    Handle the checkpoint logic for a sync function.
+
+    :param func: callable
+        The function being decorated.
+    :param content: object
+        The content object with a `state` and `STATES` attribute.
+    :param state: str
+        The name of the state to update.
+    :return: Any
+        The result of the function execution or the return value of the skipped state.
+    """
+    if _should_skip(func, content, state):
+        return content.STATES[state][1]
+    result = func(content, *args, **kwargs)
+    _complete_checkpoint(content, state)
+    return result
+
+
+async def _handle_checkpoint_async(func, content, state, *args, **kwargs):
+    """
+    Handle the checkpoint logic for an async function.
+
+    :param func: callable
+        The coroutine function being decorated.
+    :param content: object
+        The content object with a `state` and `STATES` attribute.
+    :param state: str
+        The name of the state to update.
+    :return: Any
+        The result of the function execution or the return value of the skipped state.
+    """
+    if _should_skip(func, content, state):
+        return content.STATES[state][1]
+    result = await func(content, *args, **kwargs)
+    _complete_checkpoint(content, state)
     return result
 
 
@@ -68,13 +125,17 @@ def _save_state(content):
     """
     Save the current state of the content object to a simple text file.
 
+    The state is written to a temporary file that then replaces the state
+    file, so an interrupted write never leaves a truncated state behind.
+
     :param content: object
         The content object with a `state` attribute.
     """
     state_file = content.dir + "/.state"
     try:
-        with open(state_file, "w") as file:
+        with open(state_file + ".tmp", "w") as file:
             file.write(content.state)  # Write the current state as plain text
+        os.replace(state_file + ".tmp", state_file)
         logger.info(f"State saved to {state_file}: {content.state}")
     except Exception as e:
         logger.error(f"Failed to save state to {state_file}: {e}")
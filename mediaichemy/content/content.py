@@ -8,6 +8,9 @@ import gc
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Files a purge leaves in place, besides the finished videos
+PURGE_KEEP = frozenset({"idea.json", "image.jpg", "video.mp4"})
+
 
 class Content(ABC):
     """
@@ -102,29 +105,42 @@ class Content(ABC):
         """
         Deletes the content directory and all its contents.
         """
-        for file_name in os.listdir(self.dir):
-            file_path = os.path.join(self.dir, file_name)
-            if os.path.isfile(file_path):
-                # Keep files that match the criteria
+        with os.scandir(self.dir) as entries:
+            for entry in entries:
+                # Keep directories and the files that match the criteria
                 if (
-                    ready_string in file_name or
-                    file_name in {"idea.json", "image.jpg", "video.mp4"}
+                    not entry.is_file() or
+                    entry.name in PURGE_KEEP or
+                    ready_string in entry.name
                 ):
                     continue
                 # Delete other files
-                os.remove(file_path)
-                logger.debug(f"Deleted: {file_path}")
+                os.remove(entry.path)
+                logger.debug(f"Deleted: {entry.path}")
         gc.collect()
 
     def list_files(self, extensions=None):
         """
         List all files in the given path. If extensions are provided, filter files by those extensions.
         :param extensions: List of file extensions to filter (default: None, which lists all files).
+        A single extension may also be given as a string.
         :return: List of file paths.
         """
+        if isinstance(extensions, str):
+            extensions = (extensions,)
+        # str.endswith checks every extension in one call
+        suffixes = None if extensions is None else tuple(ext.lower() for ext in extensions)
         files_list = []
-        for root, _, files in os.walk(self.dir):
-            for file in files:
-                if extensions is None or any(file.lower().endswith(ext) for ext in extensions):
-                    files_list.append(os.path.join(root, file))
+        directories = [self.dir]
+        while directories:
+            subdirectories = []
+            # Directory entries already know their type, so no file is stat'ed
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file() and (suffixes is None or entry.name.lower().endswith(suffixes)):
+                        files_list.append(entry.path)
+            # Subdirectories are listed after their parent's files, in the order they were found
+            directories.extend(reversed(subdirectories))
         return files_list
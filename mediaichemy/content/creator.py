@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+import asyncio
+import os
 from mediaichemy.content.content import Content
-from mediaichemy.ai.request import ai_request
-from mediaichemy.content.checkpoint import checkpoint
+from mediaichemy.ai.request import ai_request, gather_media
+from mediaichemy.configs import get_config_manager
+from mediaichemy.content.checkpoint import checkpoint, checkpoint_reached
 from mediaichemy.tools import edit_audio, edit_text, edit_video
 
 
@@ -16,6 +19,30 @@ class ContentCreator(ABC):
     async def create(self, idea: Content, **kwargs) -> None:
         raise NotImplementedError("Subclasses must implement this method.")
 
+    async def create_batch(self, contents: list, max_concurrent: int = None) -> list:
+        """
+        Creates several contents concurrently.
+
+        The editing steps run ffmpeg as subprocesses, so the contents are
+        spread over the cores while the event loop waits on them.
+
+        :param contents: list
+            The contents to create.
+        :param max_concurrent: int, optional
+            How many contents are created at once. Defaults to half the CPU count.
+        :return: list
+            The created media, in the order of the contents.
+        """
+        slots = asyncio.Semaphore(max_concurrent or max(1, (os.cpu_count() or 2) // 2))
+
+        async def create(content):
+            async with slots:
+                return await self.create(content)
+
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(create(content)) for content in contents]
+        return [task.result() for task in tasks]
+
     @staticmethod
     @checkpoint('image_created')
     async def run_image_creation(content):
@@ -28,8 +55,8 @@ class ContentCreator(ABC):
     @checkpoint('video_created')
     async def run_video_creation(content, image, creation_method):
         if creation_method == 'static_image':
-            video = edit_video.create_video_from_image(image=image,
-                                                       duration=5)
+            video = await edit_video.create_video_from_image(image=image,
+                                                             duration=5)
         if creation_method == 'ai':
             video = await ai_request(media="video",
                                      prompt=content.image_prompt,
@@ -37,66 +64,88 @@ class ContentCreator(ABC):
                                      input_path=image.filepath)
         return video
 
+    @staticmethod
+    async def request_speechs(content):
+        # Speech for each language is independent, so the requests run concurrently
+        speechs = await gather_media([{"media": "speech",
+                                       "prompt": content.texts.get_text(language),
+                                       "output_path": f'{content.dir}/{language}_speech.mp3'}
+                                      for language in content.languages])
+        return dict(zip(content.languages, speechs))
+
+    @staticmethod
+    def start_speech_requests(content):
+        # Speech is only requested when its checkpoint has not been reached yet
+        if checkpoint_reached(content, 'speech_created'):
+            return None
+        return asyncio.create_task(ContentCreator.request_speechs(content))
+
     @staticmethod
     @checkpoint('speech_created')
-    async def run_speech_creation(content):
-        lang_speechs = {}
-        for language in content.languages:
-            text = content.texts.get_text(language)
-            speech = await ai_request(media="speech",
-                                      prompt=text,
-                                      output_path=f'{content.dir}/{language}_speech.mp3')
-            lang_speechs[language] = speech
-        return lang_speechs
+    async def run_speech_creation(content, pending_speechs=None):
+        # Speech may already be in flight, started ahead of the earlier checkpoints
+        if pending_speechs is not None:
+            return await pending_speechs
+        return await ContentCreator.request_speechs(content)
 
     @staticmethod
     @checkpoint('video_edited')
     async def run_video_editing(content, video, speechs, extension_method):
-        edited_videos = {}
-        for language in content.languages:
-            speech = speechs[language]
-            speech_s = edit_audio.add_silence(speech)
-            lang_video = video.copy_to(f'{content.dir}/{language}_video.mp4')
-            lang_video = await edit_video.extend_to_duration(lang_video,
-                                                             target_duration=speech_s.get_duration(),
-                                                             prompt=content.image_prompt,
-                                                             method=extension_method)
-            background = edit_audio.add_audio_background(speech_s)
-            audio_video = edit_video.add_audio_to_video(lang_video, background)
-            edited_video = audio_video.copy_to(f'{content.dir}/{language}_edited_video.mp4')
-            edited_videos[language] = edited_video
-        return edited_videos
+        config_manager = get_config_manager()
+        silence = config_manager.get('audio.silence.duration')
+
+        # The background track is downloaded while the video is being extended;
+        # the video is extended once to the longest speech, shorter languages are cut by their audio
+        async with asyncio.TaskGroup() as group:
+            # One background track is downloaded for all languages
+            background = group.create_task(edit_audio.download_background(f'{content.dir}/background.mp3'))
+            extension = group.create_task(edit_video.extend_to_duration(
+                video,
+                target_duration=max(speech.get_duration() for speech in speechs.values()) + silence,
+                prompt=content.image_prompt,
+                method=extension_method))
+
+        # Each language is padded, mixed and muxed by a single ffmpeg run
+        edited = await asyncio.gather(*(edit_video.render_final(
+            extension.result(), speechs[language],
+            output_path=f'{content.dir}/{language}_edited_video.mp4',
+            silence=silence,
+            background=background.result(),
+            relative_volume=config_manager.get('audio.background.relative_volume'))
+            for language in content.languages))
+        return dict(zip(content.languages, edited))
 
     @staticmethod
     @checkpoint('video_edited')
     async def run_video_editing2(content, video, youtube_url, extension_method):
-        extended_video = await edit_video.extend_to_duration(video,
-                                                             target_duration=content.duration,
-                                                             prompt=content.image_prompt,
-                                                             method=extension_method)
-        audio = edit_audio.download_from_youtube([youtube_url],
-                                                 output_path=content.dir + '/audio.mp3')
-        part = edit_audio.extract_section(audio, start=content.start,
-                                          duration=content.duration,)
-        audio_video = edit_video.add_audio_to_video(extended_video, part)
-        edited_video = audio_video.copy_to(f'{content.dir}/edited_video.mp4')
+        # The music is downloaded while the video is being extended
+        extended_video, audio = await asyncio.gather(
+            edit_video.extend_to_duration(video,
+                                          target_duration=content.duration,
+                                          prompt=content.image_prompt,
+                                          method=extension_method),
+            edit_audio.download_from_youtube([youtube_url],
+                                             output_path=content.dir + '/audio.mp3'))
+        audio_video = await edit_video.add_audio_to_video(extended_video, audio,
+                                                          start=content.start,
+                                                          duration=content.duration)
+        edited_video = audio_video.move_to(f'{content.dir}/edited_video.mp4')
         return edited_video
 
     @staticmethod
     @checkpoint('subtitles_added')
     async def run_subtitling(content, videos):
-        subtitled_videos = {}
-        for language in content.languages:
-            video = videos[language]
-            text = content.texts.get_text(language)
-            text_editor = edit_text.Subtitles(text=text, video=video)
-            langsub_videos = text_editor.add_text_to_video()
-            subtitled_videos[language] = langsub_videos
-        return subtitled_videos
+        async def subtitle_language(language):
+            text_editor = edit_text.Subtitles(text=content.texts.get_text(language), video=videos[language])
+            return await text_editor.add_text_to_video()
+
+        # Each language renders its own subtitled videos, so they run concurrently
+        subtitled = await asyncio.gather(*(subtitle_language(language) for language in content.languages))
+        return dict(zip(content.languages, subtitled))
 
     @staticmethod
     @checkpoint('subtitles_added')
     async def run_subtitling2(content, video):
         text_editor = edit_text.Subtitles(text=' ', video=video)
-        subvideos = text_editor.add_subtitles(content.subtitles)
+        subvideos = await text_editor.add_subtitles(content.subtitles)
         return subvideos
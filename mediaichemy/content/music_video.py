@@ -1,14 +1,43 @@
+from functools import cached_property
 from pydantic.dataclasses import dataclass
 from typing import Dict, List, Union
 from mediaichemy.tools.edit_text import YoutubeCaption
-from mediaichemy.tools.utils import validate_types, extract_json
+from mediaichemy.tools.utils import extract_json
 from mediaichemy.content.content import Content
 from mediaichemy.ai.request import ai_request
 from mediaichemy.content.creator import ContentCreator
-from mediaichemy.configs import ConfigManager
+from mediaichemy.configs import get_config_manager
 from mediaichemy.tools.filehandling import JPEGFile, MP4File
 import gc
 
+MUSIC_VIDEO_PROMPT = (
+    "Extract {n_ideas} interesting sections from the subtitles I'm about to give you. "
+    "Each section will be used to make one video for social media. "
+    "Each section is made of multiple subtitles, with start, end, and text.\n"
+    "Along with each section, create a caption that goes along it on social media\n"
+    "The caption should be in the same language as the subtitles and can contain emojis.\n"
+    "Along with each section, create a prompt for creating a video that goes along it."
+    "The prompt should be in english"
+    "The image prompt should start with: {img_tags}\n"
+    "The subtitles should be in order and should not overlap each other."
+    "Keep start and end the same as provided below. "
+    "It is okay if the sections intersect with each other, but this is not preferred. "
+    "Each section should have around {n_subtitles} subtitles.\n"
+    "Return them as a JSON in the following format \n"
+    "   {{'section': [{{'end':..., 'start':..., 'text': ...}},"
+    "                {{'end':..., 'start':..., 'text': ...}}],"
+    "    'caption': '...',"
+    "    'image_prompt': '...'}},"
+    "   {{'section': [{{'end':..., 'start':..., 'text': ...}},"
+    "                {{'end':..., 'start':..., 'text': ...}}],"
+    "    'caption': '...'}}"
+    "   {{'section': [{{'end':..., 'start':..., 'text': ...}},"
+    "                {{'end':..., 'start':..., 'text': ...}}],"
+    "    'caption': '...',"
+    "    'image_prompt': '...'}}\n"
+    "These are the subtitles: \n{subtitles}"
+)
+
 
 @dataclass
 class MusicVideoPrompt:
@@ -22,31 +51,12 @@ class MusicVideoPrompt:
         self.subtitles = yt_captions.get_subtitles()
 
     def generate_prompt(self) -> str:
-        return (f"Extract {self.n_ideas} interesting sections from the subtitles I'm about to give you. "
-                f"Each section will be used to make one video for social media. "
-                "Each section is made of multiple subtitles, with start, end, and text.\n"
-                "Along with each section, create a caption that goes along it on social media\n"
-                "The caption should be in the same language as the subtitles and can contain emojis.\n"
-                "Along with each section, create a prompt for creating a video that goes along it."
-                "The prompt should be in english"
-                f"The image prompt should start with: {self.img_tags}\n"
-                "The subtitles should be in order and should not overlap each other."
-                "Keep start and end the same as provided below. "
-                "It is okay if the sections intersect with each other, but this is not preferred. "
-                f"Each section should have around {self.n_subtitles} subtitles.\n"
-                "Return them as a JSON in the following format \n"
-                "   {'section': [{'end':..., 'start':..., 'text': ...},"
-                "                {'end':..., 'start':..., 'text': ...}],"
-                "    'caption': '...',"
-                "    'image_prompt': '...'},"
-                "   {'section': [{'end':..., 'start':..., 'text': ...},"
-                "                {'end':..., 'start':..., 'text': ...}],"
-                "    'caption': '...'}"
-                "   {'section': [{'end':..., 'start':..., 'text': ...},"
-                "                {'end':..., 'start':..., 'text': ...}],"
-                "    'caption': '...',"
-                "    'image_prompt': '...'}\n"
-                f"These are the subtitles: \n{self.subtitles}")
+        return MUSIC_VIDEO_PROMPT.format_map({
+            "n_ideas": self.n_ideas,
+            "img_tags": self.img_tags,
+            "n_subtitles": self.n_subtitles,
+            "subtitles": self.subtitles,
+        })
 
 
 class MusicVideo(Content):
@@ -63,7 +73,6 @@ class MusicVideo(Content):
              "subtitles_added": [5, 'Content created']
              }
 
-    @validate_types
     def initialize_specific_attributes(self, data: dict) -> None:
         self.subtitles: List[dict] = data['section']
         self.image_prompt: str = data['image_prompt']
@@ -79,25 +88,35 @@ class MusicVideo(Content):
 
 class MusicVideoCreator(ContentCreator):
     def __init__(self):
-        self.configs = ConfigManager().get('content.music_video')
-        prompt = MusicVideoPrompt(
+        self.configs = get_config_manager().get('content.music_video')
+        super().__init__(content_type="music_video")
+
+    @cached_property
+    def music_video_prompt(self) -> MusicVideoPrompt:
+        # Building the prompt downloads the video's captions, so it waits until first use
+        return MusicVideoPrompt(
             n_ideas=self.configs['n_ideas'],
             img_tags=self.configs['img_tags'],
             video_url=self.configs['video_url'],
             n_subtitles=self.configs['n_subtitles']
         )
-        self.prompt = prompt.generate_prompt()
-        self.subtitles = prompt.subtitles
 
-        super().__init__(content_type="music_video")
+    @cached_property
+    def prompt(self) -> str:
+        return self.music_video_prompt.generate_prompt()
+
+    @property
+    def subtitles(self) -> List[dict]:
+        return self.music_video_prompt.subtitles
 
     async def generate_ideas(self):
         raw_ideas = await ai_request(media="text", prompt=self.prompt)
-        ideas = [dict(x) for x in extract_json(raw_ideas)]
+        # Parsed ideas are already dicts, so they are only converted when they are not
+        ideas = [x if type(x) is dict else dict(x) for x in extract_json(raw_ideas)]
         return ideas
 
     async def create(self, content: MusicVideo) -> None:
-        config_manager = ConfigManager()
+        config_manager = get_config_manager()
         image = await self.run_image_creation(content)
         video = await self.run_video_creation(content, image,
                                               creation_method=config_manager.get('video.creation_method'))
@@ -1,13 +1,42 @@
+from functools import cache, cached_property
 from pydantic.dataclasses import dataclass
 from typing import Dict, List, Union
-from mediaichemy.tools.language import Languages, LanguageTexts
-from mediaichemy.tools.utils import validate_types, extract_json
+from mediaichemy.tools.language import LanguageTexts, get_languages
+from mediaichemy.tools.utils import extract_json
 from mediaichemy.content.content import Content
 from mediaichemy.ai.request import ai_request
 from mediaichemy.content.creator import ContentCreator
-from mediaichemy.configs import ConfigManager
+from mediaichemy.configs import get_config_manager
 from mediaichemy.tools.filehandling import JPEGFile, MP3File, MP4File
 
+SHORT_VIDEO_PROMPT = (
+    "Create {n_ideas} texts for social media.\n"
+    "Don't include emojis\n\n"
+    "Text details: {text_details}\n\n"
+    "For each text write a prompt for creating an image that "
+    "follows it. Image prompt should be in the following format: "
+    "tag1, tag2, tag3, etc. First tags are: {img_tags}\n\n"
+    "For each text and image write a caption that follows it.\n"
+    "Don't include hashtags.\n\n"
+    "Make a version of the text and caption to each of the "
+    "following languages:\n {language_names}\n\n"
+    "The result should be given as a json in the following way:\n"
+    "Languages should be represented by their respective codes:\n"
+    " {language_codes}\n"
+    "    {{\n"
+    "        \"texts\": {{\"language1\": \"the language1 text goes here\",\n"
+    "                \"language2\": \"the language2 text goes here\",\n"
+    "                \"etc...\"}},\n"
+    "        \"image_prompt\": \"the image prompt goes here\",\n"
+    "        \"captions\": {{\"language1\": \"the language1 caption goes here\",\n"
+    "                \"language2\": \"the language2 caption goes here\",\n"
+    "                \"etc...\"}},\n"
+    "        \"languages\": [\"language1\", \"language2\"],\n"
+    "    }},\n"
+    "    {{etc..}}\n"
+    "]\n"
+)
+
 
 @dataclass
 class ShortVideoPrompt:
@@ -17,36 +46,24 @@ class ShortVideoPrompt:
     languages: List[str]
 
     def __post_init__(self):
-        self.languages = Languages(self.languages)
+        self.languages = get_languages(self.languages)
 
     def generate_prompt(self) -> str:
-        return (
-            f"Create {self.n_ideas} texts for social media.\n"
-            f"Don't include emojis\n\n"
-            f"Text details: {self.text_details}\n\n"
-            f"For each text write a prompt for creating an image that "
-            f"follows it. Image prompt should be in the following format: "
-            f"tag1, tag2, tag3, etc. First tags are: {self.img_tags}\n\n"
-            f"For each text and image write a caption that follows it.\n"
-            f"Don't include hashtags.\n\n"
-            f"Make a version of the text and caption to each of the "
-            f"following languages:\n {', '.join(self.languages.get_names())}\n\n"
-            f"The result should be given as a json in the following way:\n"
-            f"Languages should be represented by their respective codes:\n"
-            f" {', '.join(self.languages.get_codes())}\n"
-            f"    {{\n"
-            f"        \"texts\": {{\"language1\": \"the language1 text goes here\",\n"
-            f"                \"language2\": \"the language2 text goes here\",\n"
-            f"                \"etc...\"}},\n"
-            f"        \"image_prompt\": \"the image prompt goes here\",\n"
-            f"        \"captions\": {{\"language1\": \"the language1 caption goes here\",\n"
-            f"                \"language2\": \"the language2 caption goes here\",\n"
-            f"                \"etc...\"}},\n"
-            f"        \"languages\": [\"language1\", \"language2\"],\n"
-            f"    }},\n"
-            f"    {{etc..}}\n"
-            f"]\n"
-        )
+        return SHORT_VIDEO_PROMPT.format_map({
+            "n_ideas": self.n_ideas,
+            "text_details": self.text_details,
+            "img_tags": self.img_tags,
+            "language_names": ', '.join(self.languages.get_names()),
+            "language_codes": ', '.join(self.languages.get_codes()),
+        })
+
+
+@cache
+def _short_video_prompt(n_ideas: int, text_details: str, img_tags: str, languages: tuple) -> str:
+    return ShortVideoPrompt(n_ideas=n_ideas,
+                            text_details=text_details,
+                            img_tags=img_tags,
+                            languages=list(languages)).generate_prompt()
 
 
 class ShortVideo(Content):
@@ -68,38 +85,46 @@ class ShortVideo(Content):
              "subtitles_added": [5, 'Content created']
              }
 
-    @validate_types
     def initialize_specific_attributes(self, data: dict) -> None:
         self.texts: Dict[str, str] = LanguageTexts(data['texts'])
         self.image_prompt: str = data['image_prompt']
         self.captions: Dict[str, str] = LanguageTexts(data['captions'])
-        self.languages: List[str] = Languages(data['languages']).codes
+        # Copied, since the resolved languages are cached and shared between contents
+        self.languages: List[str] = list(get_languages(data['languages']).codes)
 
 
 class ShortVideoCreator(ContentCreator):
     def __init__(self):
-        self.configs = ConfigManager().get('content.short_video')
-
-        self.prompt = ShortVideoPrompt(
-            n_ideas=self.configs['n_ideas'],
-            text_details=self.configs['text_details'],
-            img_tags=self.configs['img_tags'],
-            languages=self.configs['languages']
-        ).generate_prompt()
-
+        self.configs = get_config_manager().get('content.short_video')
         super().__init__(content_type="short_video")
 
+    @cached_property
+    def prompt(self) -> str:
+        # Formatted once per distinct configuration, then shared by every creator
+        return _short_video_prompt(self.configs['n_ideas'],
+                                   self.configs['text_details'],
+                                   self.configs['img_tags'],
+                                   tuple(self.configs['languages']))
+
     async def generate_ideas(self):
         raw_ideas = await ai_request(media="text", prompt=self.prompt)
-        ideas = [dict(x) for x in extract_json(raw_ideas)]
+        # Parsed ideas are already dicts, so they are only converted when they are not
+        ideas = [x if type(x) is dict else dict(x) for x in extract_json(raw_ideas)]
         return ideas
 
     async def create(self, content: ShortVideo) -> None:
-        config_manager = ConfigManager()
-        image = await self.run_image_creation(content)
-        video = await self.run_video_creation(content, image,
-                                              creation_method=config_manager.get('video.creation_method'))
-        speech = await self.run_speech_creation(content)
+        config_manager = get_config_manager()
+        # Speech only needs the texts, so it is generated while the image and video are
+        pending_speechs = self.start_speech_requests(content)
+        try:
+            image = await self.run_image_creation(content)
+            video = await self.run_video_creation(content, image,
+                                                  creation_method=config_manager.get('video.creation_method'))
+            speech = await self.run_speech_creation(content, pending_speechs)
+        except BaseException:
+            if pending_speechs is not None:
+                pending_speechs.cancel()
+            raise
         edited_videos = await self.run_video_editing(content, video, speech,
                                                      extension_method=config_manager.get('video.extension_method'))
         subtitled_videos = await self.run_subtitling(content, edited_videos)
@@ -1,15 +1,22 @@
+import hashlib
+import os
+import shutil
 import subprocess
 from mediaichemy.tools.filehandling import MP3File
 import logging
 import random
-from mediaichemy.configs import ConfigManager
-from mediaichemy.tools.utils import log
+from mediaichemy.configs import get_config_manager
+from mediaichemy.tools.utils import FFMPEG, log, run_command
 
 logger = logging.getLogger(__name__)
 
+# Downloaded tracks are kept here across runs, named after a hash of their URL
+YOUTUBE_CACHE_DIR = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                                 "mediaichemy", "youtube")
+
 
 @log
-def download_from_youtube(urls: list, output_path: str) -> MP3File:
+async def download_from_youtube(urls: list, output_path: str) -> MP3File:
     """
     Download audio from a list of YouTube URLs and convert it to MP3 format.
     If multiple URLs are provided, one is selected at random.
@@ -30,6 +37,13 @@ def download_from_youtube(urls: list, output_path: str) -> MP3File:
     selected_url = random.choice(urls)
     logger.info(f"Selected URL for download: {selected_url}")
 
+    cache_path = os.path.join(YOUTUBE_CACHE_DIR,
+                              f"{hashlib.blake2b(selected_url.encode()).hexdigest()[:16]}.mp3")
+    if os.path.isfile(cache_path):
+        shutil.copy(cache_path, output_path)
+        logger.info(f"Audio copied from cache to: {output_path}")
+        return MP3File(output_path)
+
     try:
         # Use yt-dlp to download the audio
         command = [
@@ -39,72 +53,54 @@ def download_from_youtube(urls: list, output_path: str) -> MP3File:
             "-o", output_path,  # Output file path
             selected_url
         ]
-        result = subprocess.run(command, check=True,
-                                capture_output=True,
-                                text=True
-                                )
-        if "ERROR" in result.stderr:
-            logger.error("Error downloading background music")
-            logger.error("If you are using a VPN consider disabling it")
-            logger.error(result.stderr)
+        # A failed download exits with a non-zero status, which run_command raises
+        await run_command(command)
         logger.info(f"Audio downloaded successfully to: {output_path}")
+        if os.path.isfile(output_path):
+            _store_in_cache(output_path, cache_path)
 
         # Return the MP3File object
         return MP3File(output_path)
 
     except subprocess.CalledProcessError as e:
         logger.error(f"Failed to download audio from URL {selected_url}: {e}")
+        logger.error("If you are using a VPN consider disabling it")
         raise
 
 
-# @log
-def add_silence(audio, duration: int = None) -> MP3File:
-    silence_path = audio.filepath.replace(".mp3", "_silence.mp3")
-
-    if duration is None:
-        duration = ConfigManager().get('audio.silence.duration')
-    if not audio:
-        raise ValueError("No MP3 file provided to add silence to.")
-    if duration <= 0:
-        raise ValueError("Duration of silence must be greater than 0.")
+def _store_in_cache(path: str, cache_path: str) -> None:
+    """
+    Copies a downloaded file into the download cache.
 
-    try:
-        # Use ffmpeg to add silence to the end of the audio file
-        command = [
-            "ffmpeg",
-            "-y",  # Overwrite output file if it exists
-            "-i", audio.filepath,  # Input MP3 file
-            "-f", "lavfi",  # Use lavfi to generate silence
-            "-t", str(duration),  # Duration of silence
-            "-i", "anullsrc=channel_layout=stereo:sample_rate=44100",  # Generate silence
-            "-filter_complex", "[0:a][1:a]concat=n=2:v=0:a=1[out]",  # Concatenate audio and silence
-            "-map", "[out]",  # Map the output
-            silence_path
-        ]
-        subprocess.run(command, check=True)
-        return MP3File(silence_path)
+    The copy is written under a temporary name and then moved into place,
+    so concurrent runs never read a partially written cache entry.
 
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to add silence to audio file: {e}")
-        raise
+    :param path: str
+        The downloaded file.
+    :param cache_path: str
+        The path of the cache entry.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    partial_path = f"{cache_path}.{os.getpid()}.part"
+    shutil.copy(path, partial_path)
+    os.replace(partial_path, cache_path)
 
 
 @log
-def extract_section(audio, start: int, duration: int) -> MP3File:
+async def extract_section(audio, start: int, duration: int) -> MP3File:
     section_path = audio.filepath.replace(".mp3", "_part.mp3")
 
     try:
         # Use ffmpeg to extract the section
         command = [
-            "ffmpeg",
-            "-y",  # Overwrite output file if it exists
+            *FFMPEG,
             "-i", audio.filepath,  # Input MP3 file
             "-ss", str(start),  # Start time
             "-t", str(duration),  # Duration
             "-c", "copy",  # Copy the audio stream without re-encoding
             section_path
         ]
-        subprocess.run(command, check=True)
+        await run_command(command)
 
         return MP3File(section_path)
     except subprocess.CalledProcessError as e:
@@ -112,10 +108,19 @@ def extract_section(audio, start: int, duration: int) -> MP3File:
         raise
 
 
-@log
-def extract_random_section(audio, duration: int) -> MP3File:
-    section_path = audio.filepath.replace(".mp3", "_random_part.mp3")
-
+def random_start(audio, duration: float) -> int:
+    """
+    Picks a random start time for a section of the given duration.
+
+    :param audio: MP3File
+        The audio the section is taken from.
+    :param duration: float
+        The duration of the section in seconds.
+    :return: int
+        The start time of the section in seconds.
+    :raises ValueError:
+        If the section is longer than the audio.
+    """
     # Get the total duration of the MP3 file
     total_duration = audio.get_duration()
     if duration > total_duration:
@@ -125,79 +130,19 @@ def extract_random_section(audio, duration: int) -> MP3File:
     # Calculate a random start time
     start_time = random.randint(0, int(total_duration - duration))
     logger.info(f"Extracting a section from {start_time}s to {start_time + duration}s.")
+    return start_time
 
-    try:
-        # Use ffmpeg to extract the section
-        command = [
-            "ffmpeg",
-            "-y",  # Overwrite output file if it exists
-            "-i", audio.filepath,  # Input MP3 file
-            "-ss", str(start_time),  # Start time
-            "-t", str(duration),  # Duration
-            "-c", "copy",  # Copy the audio stream without re-encoding
-            section_path
-        ]
-        subprocess.run(command, check=True)
-
-        return MP3File(section_path)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to extract audio section: {e}")
-        raise
-
-
-@log
-def mix_audio(audio: MP3File, audio2: MP3File, relative_volume: float = 1.0) -> MP3File:
-    mix_path = audio.filepath.replace(".mp3", "_mix.mp3")
-
-    if not audio:
-        raise ValueError("No MP3 file provided to mix with.")
-    if not audio2:
-        raise ValueError("No other MP3 file provided to mix with.")
-    if not (0.0 <= relative_volume <= 2.0):
-        raise ValueError("relative_volume must be between 0 and 2.")
-
-    # Calculate volume adjustments
-    original_volume = 2.0 - relative_volume  # Volume for the original file
-    new_volume = relative_volume  # Volume for the new file
-
-    try:
-        # Use ffmpeg to overlay the audio files with adjusted volumes
-        command = [
-            "ffmpeg",
-            "-y",  # Overwrite output file if it exists
-            "-i", audio.filepath,  # Input first MP3 file
-            "-i", audio2.filepath,  # Input second MP3 file
-            "-filter_complex", (f"[0:a]volume={original_volume}"
-                                f"[a0];[1:a]volume={new_volume}"
-                                "[a1];[a0][a1]amix=inputs=2:duration=longest:dropout_transition=2"),
-            "-c:a", "libmp3lame",  # Encode to MP3
-            mix_path
-        ]
-        subprocess.run(command, check=True)
-        logger.info("Audio files mixed successfully. Original file overwritten.")
-        return MP3File(mix_path)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to mix audio files: {e}")
-        raise
 
+async def download_background(output_path: str) -> MP3File:
+    """
+    Downloads one of the configured background tracks, so it can be shared by several audios.
 
-@log
-def add_audio_background(audio, background: MP3File = None) -> MP3File:
-    background_path = audio.filepath.replace(".mp3", "_background.mp3")
-
-    configs = ConfigManager().get(table='audio.background')
-    background_urls = configs.get('urls')
-    relative_volume = configs.get('relative_volume')
-
-    if not background and not background_urls:
-        logger.warning("No background audio provided or available. Returning original audio.")
-        return audio
-    if not background:
-        if background_urls:
-            background = download_from_youtube(background_urls,
-                                               output_path=background_path)
-    background_section = extract_random_section(background, duration=audio.get_duration())
-    mixed_audio = mix_audio(audio=audio,
-                            audio2=background_section, relative_volume=relative_volume)
-
-    return mixed_audio
+    :param output_path: str
+        The path to save the downloaded MP3 file.
+    :return: MP3File
+        The background track, or None if no background URLs are configured.
+    """
+    background_urls = get_config_manager().get(table='audio.background').get('urls')
+    if not background_urls:
+        return None
+    return await download_from_youtube(background_urls, output_path=output_path)
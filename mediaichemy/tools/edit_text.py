@@ -1,15 +1,21 @@
+import asyncio
 import os
 import subprocess
 import re
 import logging
+from itertools import accumulate
 from mediaichemy.tools.filehandling import MP4File
-from mediaichemy.configs import ConfigManager
+from mediaichemy.tools.utils import FFMPEG, run_command
+from mediaichemy.configs import get_config_manager
 import pysubs2
 from youtube_transcript_api import YouTubeTranscriptApi
 
 
 logger = logging.getLogger(__name__)
 
+# The spaces after a punctuation mark, where subtitles are split
+SENTENCE_BREAK = re.compile(r'(?<=[.,!?]) +')
+
 
 subtitle_alignments = {
                 "bottom_left": pysubs2.Alignment.BOTTOM_LEFT,
@@ -24,6 +30,56 @@ subtitle_alignments = {
             }
 
 
+# The configuration the subtitle styles were built from, and the styles by alignment
+_style_cache = (None, None)
+
+
+def _subtitle_styles() -> dict[int, pysubs2.SSAStyle]:
+    """
+    Returns the subtitle style for each configured alignment.
+
+    The styles are built once from the subtitles table of the configs and
+    rebuilt only when the configuration is reloaded.
+
+    :return: A dictionary mapping alignments to their styles.
+    :rtype: dict[int, pysubs2.SSAStyle]
+    """
+    global _style_cache
+    config_manager = get_config_manager()
+    if _style_cache[0] is config_manager:
+        return _style_cache[1]
+    configs = config_manager.get(table='subtitles')
+    # Fetch alignment from configs and map it using the subtitle_alignments dictionary
+    alignments = [subtitle_alignments[alignment_str] for alignment_str in configs.get('alignment')]
+    style = pysubs2.SSAStyle()
+    style.fontname = configs['fontname']
+    style.fontsize = configs['fontsize']
+    style.primarycolor = pysubs2.Color(*map(int, configs['primarycolor'].split(',')))
+    style.secondarycolor = pysubs2.Color(*map(int, configs['secondarycolor'].split(',')))
+    style.outlinecolor = pysubs2.Color(*map(int, configs['outlinecolor'].split(',')))
+    style.backcolor = pysubs2.Color(*map(int, configs['backcolor'].split(',')))
+    style.bold = configs['bold']
+    style.italic = configs['italic']
+    style.underline = configs['underline']
+    style.strikeout = configs['strikeout']
+    style.scalex = configs['scalex']
+    style.scaley = configs['scaley']
+    style.spacing = configs['spacing']
+    style.angle = configs['angle']
+    style.borderstyle = configs['borderstyle']
+    style.outline = configs['outline']
+    style.shadow = configs['shadow']
+    style.marginl = configs['margin_l']
+    style.marginr = configs['margin_r']
+    style.marginv = configs['margin_v']
+    styles = {}
+    for alignment in alignments:
+        styles[alignment] = style.copy()
+        styles[alignment].alignment = alignment
+    _style_cache = (config_manager, styles)
+    return styles
+
+
 class Subtitles:
     """
     Handles text editing operations, including generating and adding subtitles to a video.
@@ -40,7 +96,7 @@ class Subtitles:
         self.video = video
 
     # @log
-    def add_text_to_video(self, output_path: str = None) -> MP4File:
+    async def add_text_to_video(self, output_path: str = None) -> MP4File:
         """
         Generates subtitles from the text and adds them to the video.
 
@@ -56,13 +112,13 @@ class Subtitles:
 
         # Get the video duration
         print(self.video)
-        duration = self.video.get_duration() - ConfigManager().get(key='audio.silence.duration')
+        duration = self.video.get_duration() - get_config_manager().get(key='audio.silence.duration')
 
         # Generate subtitles from the text
         subtitles = self.generate_subtitles(duration=duration)
 
         # Add subtitles to the video
-        subtitled_videos = self.add_subtitles(subtitles=subtitles)
+        subtitled_videos = await self.add_subtitles(subtitles=subtitles)
 
         logger.info("Text successfully added to the video as subtitles.")
         return subtitled_videos
@@ -84,19 +140,16 @@ class Subtitles:
         letter_duration = duration / len(self.text)
 
         sentences = self._punctuation_split(self.text)
-        subtitles = []
-        start = 0
-
-        for sentence in sentences:
-            end = start + letter_duration * len(sentence)
-            subtitles.append({"start": start, "end": end, "text": sentence})
-            start = end
+        # Each subtitle ends after the letters of every sentence up to and including its own
+        ends = [letter_duration * letters for letters in accumulate(map(len, sentences))]
+        subtitles = [{"start": start, "end": end, "text": sentence}
+                     for sentence, start, end in zip(sentences, [0, *ends], ends)]
 
         logger.info(f"Generated {len(subtitles)} subtitles.")
         return subtitles
 
     # @log
-    def add_subtitles(self, subtitles: list[dict[str, float | str]]) -> MP4File:
+    async def add_subtitles(self, subtitles: list[dict[str, float | str]]) -> MP4File:
         """
         Adds subtitles to the video.
 
@@ -117,30 +170,39 @@ class Subtitles:
         # Create a temporary .ass subtitle file
         subtitle_path = f"{os.path.splitext(self.video.filepath)[0]}.ass"
         sub_paths = self._create_ass_subtitles(subtitles, subtitle_path)
-        subtitled_videos = []
-        for subtitle_path in sub_paths:
-            temp_output_path = subtitle_path.replace(".ass", ".mp4")
-            try:
-                # Use ffmpeg to add subtitles to the video
-                command = [
-                    "ffmpeg",
-                    "-y",
-                    "-i", self.video.filepath,  # Input video
-                    "-vf", f"subtitles={subtitle_path}",  # Add subtitles
-                    "-c:a", "copy",  # Copy the audio stream without re-encoding
-                    temp_output_path
-                ]
-                subprocess.run(command, check=True)
-                logger.info(f"Subtitles added successfully. Output saved to: {temp_output_path}")
-                subtitled_videos.append(MP4File(filepath=temp_output_path))
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to add subtitles to video: {e}")
-                raise
-            finally:
-                # Clean up the temporary subtitle file
-                if os.path.exists(subtitle_path):
-                    os.remove(subtitle_path)
-        return subtitled_videos
+        # Each alignment is burned into its own copy of the video, so the ffmpeg runs are independent
+        subtitled_videos = await asyncio.gather(*(self._burn_subtitles(sub_path) for sub_path in sub_paths))
+        return list(subtitled_videos)
+
+    async def _burn_subtitles(self, subtitle_path: str) -> MP4File:
+        """
+        Renders one .ass subtitle file onto a copy of the video and removes the subtitle file.
+
+        :param subtitle_path: The path of the .ass subtitle file.
+        :type subtitle_path: str
+        :return: The video file with the subtitles burned in.
+        :rtype: MP4File
+        """
+        temp_output_path = subtitle_path.replace(".ass", ".mp4")
+        try:
+            # Use ffmpeg to add subtitles to the video
+            command = [
+                *FFMPEG,
+                "-i", self.video.filepath,  # Input video
+                "-vf", f"subtitles={subtitle_path}",  # Add subtitles
+                "-c:a", "copy",  # Copy the audio stream without re-encoding
+                temp_output_path
+            ]
+            await run_command(command)
+            logger.info(f"Subtitles added successfully. Output saved to: {temp_output_path}")
+            return MP4File(filepath=temp_output_path)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to add subtitles to video: {e}")
+            raise
+        finally:
+            # Clean up the temporary subtitle file
+            if os.path.exists(subtitle_path):
+                os.remove(subtitle_path)
 
     # @log
     def save_subtitles_as_ass(self, output_path: str) -> list[str]:
@@ -159,7 +221,7 @@ class Subtitles:
             raise ValueError("Output path must be specified.")
 
         # Generate subtitles for the full text
-        duration = self.video.get_duration() - ConfigManager().get(key='audio.silence.duration')
+        duration = self.video.get_duration() - get_config_manager().get(key='audio.silence.duration')
         subtitles = self.generate_subtitles(duration)
         sub_paths = self._create_ass_subtitles(subtitles, output_path)
         logger.info(f"Subtitles saved as .ass file at: {output_path}")
@@ -176,47 +238,23 @@ class Subtitles:
         :return: A list of sentences.
         :rtype: list[str]
         """
-        sentences = re.split(r'(?<=[.,!?]) +', text)
-        return [sentence.strip() for sentence in sentences if sentence.strip()]
+        sentences = map(str.strip, SENTENCE_BREAK.split(text))
+        return [sentence for sentence in sentences if sentence]
 
     # @log
     @staticmethod
     def _load_subtitle_configs() -> dict[int, pysubs2.SSAFile]:
         """
-        Loads subtitle configuration settings from the configs.toml file and applies them to pysubs2.SSAFile objects.
+        Creates an SSAFile per configured alignment, styled from the configs.toml file.
 
         :return: A dictionary mapping alignments to configured SSAFile objects.
         :rtype: dict[int, pysubs2.SSAFile]
         """
-        configs = ConfigManager().get(table='subtitles')
-        # Fetch alignment from configs and map it using the subtitle_alignments dictionary
-        alignment_list = configs.get('alignment')
-        alignments = [subtitle_alignments[alignment_str] for alignment_str in alignment_list]
         subs = {}
-        for alignment in alignments:
-            # Create and configure the SSAFile object
+        for alignment, style in _subtitle_styles().items():
             sub = pysubs2.SSAFile()
-            sub.styles["Default"].fontname = configs['fontname']
-            sub.styles["Default"].fontsize = configs['fontsize']
-            sub.styles["Default"].primarycolor = pysubs2.Color(*map(int, configs['primarycolor'].split(',')))
-            sub.styles["Default"].secondarycolor = pysubs2.Color(*map(int, configs['secondarycolor'].split(',')))
-            sub.styles["Default"].outlinecolor = pysubs2.Color(*map(int, configs['outlinecolor'].split(',')))
-            sub.styles["Default"].backcolor = pysubs2.Color(*map(int, configs['backcolor'].split(',')))
-            sub.styles["Default"].bold = configs['bold']
-            sub.styles["Default"].italic = configs['italic']
-            sub.styles["Default"].underline = configs['underline']
-            sub.styles["Default"].strikeout = configs['strikeout']
-            sub.styles["Default"].scalex = configs['scalex']
-            sub.styles["Default"].scaley = configs['scaley']
-            sub.styles["Default"].spacing = configs['spacing']
-            sub.styles["Default"].angle = configs['angle']
-            sub.styles["Default"].borderstyle = configs['borderstyle']
-            sub.styles["Default"].outline = configs['outline']
-            sub.styles["Default"].shadow = configs['shadow']
-            sub.styles["Default"].alignment = alignment
-            sub.styles["Default"].margin_l = configs['margin_l']
-            sub.styles["Default"].margin_r = configs['margin_r']
-            sub.styles["Default"].margin_v = configs['margin_v']
+            # Each file gets its own copy, so the cached style is never modified
+            sub.styles["Default"] = style.copy()
             subs[alignment] = sub
         return subs
 
@@ -235,22 +273,14 @@ class Subtitles:
         """
         # Load and configure the SSAFile object
         subs = Subtitles._load_subtitle_configs()
-        print(subs)
+        # pysubs2 keeps times in whole milliseconds
+        timings = [(int(subtitle["start"] * 1000), int(subtitle["end"] * 1000), subtitle["text"])
+                   for subtitle in subtitles]
         sub_paths = []
-        for alignment in subs.keys():
+        for alignment, sub in subs.items():
             # Add subtitles to the SSAFile
-            sub = subs[alignment]
-            for subtitle in subtitles:
-                sub.append(
-                    pysubs2.SSAEvent(
-                        start=subtitle["start"] * 1000,
-                        end=subtitle["end"] * 1000,
-                        text=subtitle["text"]
-                    )
-                )
-            print(f'Alignment is: {alignment}')
-            print(f'Subs are : {subs}')
-            print(f'Sub is : {sub}')
+            sub.events.extend(pysubs2.SSAEvent(start=start, end=end, text=text)
+                              for start, end, text in timings)
             # Save the .ass file
             sub_filepath = output_path.replace(".ass", f'_{alignment}.ass')
             sub.save(sub_filepath)
@@ -1,25 +1,37 @@
+import asyncio
+import math
 import os
 import subprocess
-from math import ceil
 import logging
+from mediaichemy.configs import get_config_manager
+from mediaichemy.tools.edit_audio import random_start
 from mediaichemy.tools.filehandling import JPEGFile, MP4File
-from mediaichemy.tools.utils import log
+from mediaichemy.tools.utils import FFMPEG, log, run_command
 from mediaichemy.ai.request import ai_request
 
 logger = logging.getLogger(__name__)
 
+# Options for steps that re-encode the video: a fast x264 preset using every core
+VIDEO_ENCODING = ['-c:v', 'libx264', '-preset', 'veryfast', '-threads', '0']
+
 
 @log
-def add_audio_to_video(video, audio) -> MP4File:
+async def add_audio_to_video(video, audio, start: float = None, duration: float = None) -> MP4File:
     if not video:
         raise ValueError("No video file provided to add audio to.")
 
     video_w_audio_path = video.filepath.replace(".mp4", "_w_audio.mp4")
+    # A section of the audio is read straight from the source, with no intermediate file
+    section = []
+    if start is not None:
+        section += ["-ss", str(start)]
+    if duration is not None:
+        section += ["-t", str(duration)]
     # Use ffmpeg to combine audio and video
     command = [
-        "ffmpeg",
-        "-y",  # Overwrite output file if it exists
+        *FFMPEG,
         "-i", video.filepath,  # Input video
+        *section,
         "-i", audio.filepath,  # Input audio
         "-map", "0",  # Map all streams from the video
         "-map", "1:a",  # Map only the audio stream from the audio file
@@ -27,88 +39,171 @@ def add_audio_to_video(video, audio) -> MP4File:
         "-shortest",  # Ensure the output duration matches the shortest input
         video_w_audio_path
     ]
-    subprocess.run(command, check=True)
+    await run_command(command)
     return MP4File(video_w_audio_path)
 
 
 @log
-def apply_boomerang(video) -> MP4File:
+async def render_final(video, speech, output_path: str, silence: float = 0,
+                       background=None, relative_volume: float = 1.0) -> MP4File:
+    """
+    Renders a finished video from an extended video, its speech and an optional background track.
+
+    The speech is padded with silence, mixed with a random section of the
+    background and muxed into the video by a single ffmpeg run, so none of
+    the intermediate audio is written to disk.
+
+    :param video: MP4File
+        The video, at least as long as the padded speech.
+    :param speech: MP3File
+        The speech to put over the video.
+    :param output_path: str
+        The path of the rendered video.
+    :param silence: float
+        Seconds of silence added after the speech.
+    :param background: MP3File, optional
+        The track mixed under the speech.
+    :param relative_volume: float
+        The background volume relative to the speech, between 0 and 2.
+    :return: MP4File
+        The rendered video, as long as the padded speech.
+    """
+    if not (0.0 <= relative_volume <= 2.0):
+        raise ValueError("relative_volume must be between 0 and 2.")
+    duration = speech.get_duration() + silence
+    inputs = ["-i", video.filepath, "-i", speech.filepath]
+    audio_graph = f"[1:a]apad=pad_dur={silence}"
+    if background:
+        inputs += ["-ss", str(random_start(background, duration)), "-t", str(duration),
+                   "-i", background.filepath]
+        audio_graph += (f",volume={2.0 - relative_volume}[a0];[2:a]volume={relative_volume}[a1];"
+                        "[a0][a1]amix=inputs=2:duration=longest:dropout_transition=2")
+    await run_command(
+        [
+            *FFMPEG,
+            *inputs,
+            "-filter_complex", f"{audio_graph}[a]",
+            "-map", "0:v",
+            "-map", "[a]",
+            "-c:v", "copy",
+            "-c:a", "aac",
+            "-b:a", "192k",
+            "-shortest",
+            output_path
+        ]
+    )
+    return MP4File(output_path)
+
+
+@log
+async def loop_video(video, duration: float) -> MP4File:
+    """
+    Extends a video by looping its boomerang up to the given duration.
+
+    Only the boomerang is encoded; its repetitions and the final cut are
+    copied from it, so the encoding time does not grow with the duration.
+
+    :param video: MP4File
+        The video to extend.
+    :param duration: float
+        The duration of the resulting video in seconds.
+    :return: MP4File
+        The extended video.
+    """
+    if duration <= 0:
+        raise ValueError("The length must be greater than 0 seconds.")
     boom_path = video.filepath.replace(".mp4", "_boomerang.mp4")
-    subprocess.run(
+    loop_path = video.filepath.replace(".mp4", "_loop.mp4")
+    await run_command(
         [
-            'ffmpeg',
-            '-y',
-            '-ss', '0',
+            *FFMPEG,
             '-an',
             '-i', video.filepath,
             '-filter_complex', "[0]split[b][c];[c]reverse[r];[b][r]concat",
+            *VIDEO_ENCODING,
             boom_path
-        ],
-        check=True
+        ]
+    )
+    await run_command(
+        [
+            *FFMPEG,
+            '-stream_loop', '-1',
+            '-i', boom_path,
+            '-t', str(duration),
+            '-c', 'copy',
+            loop_path
+        ]
     )
-    return MP4File(boom_path)
+    return MP4File(loop_path)
 
 
 @log
-def concat_videos(video, n: int = 0, videos_to_add=None) -> MP4File:
+async def concat_videos(video, n: int = 0, videos_to_add=None, duration: float = None) -> MP4File:
     combined_path = video.filepath.replace(".mp4", "_concat.mp4")
     if (n > 0 and videos_to_add) or (n == 0 and not videos_to_add):
         raise ValueError("You must provide either 'n' or 'videos_to_add', but not both.")
-    concat_list_path = os.path.join(video.dir, "concat_list.txt")
-    with open(concat_list_path, "w") as f:
-        if n > 0:
-            for _ in range(n):
-                f.write(f"file '{os.path.abspath(video.filepath)}'\n")
-        elif videos_to_add:
-            f.write(f"file '{os.path.abspath(video.filepath)}'\n")
-            for video in videos_to_add:
-                f.write(f"file '{os.path.abspath(video.filepath)}'\n")
-    subprocess.run(
+    # Cutting while concatenating spares a separate trim pass over the result
+    cut = ['-t', str(duration)] if duration else []
+    if n > 0:
+        # Repeating one file needs no list: ffmpeg loops the input itself
+        await run_command(
+            [
+                *FFMPEG,
+                '-stream_loop', str(n - 1),
+                '-i', video.filepath,
+                *cut,
+                '-c', 'copy',
+                combined_path
+            ]
+        )
+        return MP4File(combined_path)
+    # The list is fed through stdin, so no list file is written next to the videos
+    concat_list = "".join(f"file '{os.path.abspath(v.filepath)}'\n" for v in [video, *videos_to_add])
+    await run_command(
         [
-            'ffmpeg',
-            '-y',
+            *FFMPEG,
             '-f', 'concat',
             '-safe', '0',
-            '-i', concat_list_path,
+            '-protocol_whitelist', 'file,pipe',
+            '-i', 'pipe:0',
+            *cut,
             '-c', 'copy',
             combined_path
         ],
-        check=True
+        input=concat_list.encode()
     )
-    os.remove(concat_list_path)
     return MP4File(combined_path)
 
 
 @log
-def trim_video(video, duration: int) -> str:
+async def trim_video(video, duration: int) -> str:
     if duration <= 0:
         raise ValueError("The length must be greater than 0 seconds.")
     trim_path = video.filepath.replace(".mp4", "_trim.mp4")
 
-    subprocess.run(
+    await run_command(
         [
-            'ffmpeg',
+            *FFMPEG,
             '-i', video.filepath,
             '-t', str(duration),
             '-c', 'copy',
-            '-y',
             trim_path
-        ],
-        check=True
+        ]
     )
     return MP4File(trim_path)
 
 
 @log
-def extract_last_frame(video) -> JPEGFile:
+async def extract_last_frame(video) -> JPEGFile:
     last_frame_path = video.filepath.replace(".mp4", "_lastframe.jpg")
     try:
-        subprocess.run(
+        # Reversing the final seconds puts the last frame first, so only that
+        # frame is encoded and written instead of overwriting the image per frame
+        await run_command(
             [
-                "ffmpeg", "-y", "-sseof", "-3", "-i", video.filepath,
-                "-vsync", "0", "-q:v", "0", "-update", "true", last_frame_path
-            ],
-            check=True
+                *FFMPEG, "-sseof", "-3", "-i", video.filepath,
+                "-vf", "reverse", "-frames:v", "1", "-q:v", "0", last_frame_path
+            ]
         )
         return JPEGFile(last_frame_path)
     except subprocess.CalledProcessError as e:
@@ -124,48 +219,76 @@ async def extend_to_duration(video, target_duration: float,
         raise ValueError("Target duration must be greater than 0 seconds.")
 
     if method == "loop":
-        boom = apply_boomerang(video)
-        # Calculate the number of repetitions needed to match or exceed the target duration
-        n_repeat = ceil(target_duration / boom.get_duration())
-        # Repeat the video
-        if n_repeat > 1:
-            extended_video = concat_videos(boom, n=n_repeat)
-        if n_repeat <= 1:
-            extended_video = boom
-    if method == "ai":
-        extended_video = await add_ai_videos(video, target_duration, prompt)
+        # A video that is already long enough only needs a cut, which copies the streams
+        if target_duration <= video.get_duration():
+            return await trim_video(video, duration=target_duration)
+        return await loop_video(video, duration=target_duration)
+    if method != "ai":
+        raise ValueError(f"Unknown extension method: {method}")
+    extended_video = await add_ai_videos(video, target_duration, prompt,
+                                         concurrency=get_config_manager().get('video.extension_concurrency'))
+    # Added videos are already cut to the target duration when concatenated
+    if extended_video is not video:
+        return extended_video
 
     # Trim the video to exactly match the target duration
-    trimd = trim_video(extended_video, duration=target_duration)
+    trimd = await trim_video(video, duration=target_duration)
 
     return trimd
 
 
 @log
-async def add_ai_videos(video, target_duration, prompt=""):
+async def add_ai_videos(video, target_duration, prompt="", concurrency: int = 1):
+    """
+    Extends a video with AI generated continuations up to the given duration.
+
+    Each round requests continuations of the last frame of the latest clip.
+    With a concurrency above 1, up to that many continuations of the same
+    frame are requested at once, trading visual continuity between them for
+    fewer sequential round trips to the provider.
+
+    :param video: MP4File
+        The video to extend.
+    :param target_duration: float
+        The duration of the resulting video in seconds.
+    :param prompt: str
+        The prompt for the generated continuations.
+    :param concurrency: int
+        The most continuations requested at the same time.
+    :return: MP4File
+        The extended video, or the video itself if it is already long enough.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1.")
     if prompt == "":
         logger.warning("No prompt provided for AI video generation.")
     current_video = video
     videos_to_add = []
-    while sum([v.get_duration() for v in [video] + videos_to_add]) < target_duration:
+    total_duration = video.get_duration()
+    while (remaining := target_duration - total_duration) > 0:
         n = len(videos_to_add)
-        n_path = video.filepath.replace(".mp4", f"_ai_extension{n}.mp4")
-        lastframe = extract_last_frame(current_video)
-        video_continue = await ai_request(media="video",
-                                          prompt=prompt,
-                                          input_path=lastframe.filepath,
-                                          output_path=n_path)
-        videos_to_add.append(video_continue)
-        current_video = video_continue
+        lastframe = await extract_last_frame(current_video)
+        # Never request more clips than the last one suggests are still needed
+        k = min(concurrency, math.ceil(remaining / current_video.get_duration()))
+        continuations = await asyncio.gather(*(
+            ai_request(media="video",
+                       prompt=prompt,
+                       input_path=lastframe.filepath,
+                       output_path=video.filepath.replace(".mp4", f"_ai_extension{n + i}.mp4"))
+            for i in range(k)))
+        videos_to_add.extend(continuations)
+        total_duration += sum(v.get_duration() for v in continuations)
+        current_video = continuations[-1]
     if len(videos_to_add) > 0:
-        extended_video = concat_videos(video, videos_to_add=videos_to_add)
+        extended_video = await concat_videos(video, videos_to_add=videos_to_add,
+                                             duration=target_duration)
     if len(videos_to_add) == 0:
         extended_video = video
     return extended_video
 
 
 @log
-def create_video_from_image(image: JPEGFile, duration: int) -> MP4File:
+async def create_video_from_image(image: JPEGFile, duration: int) -> MP4File:
     if duration <= 0:
         raise ValueError("Duration must be greater than 0 seconds.")
 
@@ -173,15 +296,14 @@ def create_video_from_image(image: JPEGFile, duration: int) -> MP4File:
 
     # Use ffmpeg to create a video from the image
     command = [
-        "ffmpeg",
-        "-y",  # Overwrite output file if it exists
+        *FFMPEG,
         "-loop", "1",  # Loop the image
         "-i", image.filepath,  # Input image
-        "-c:v", "libx264",  # Use H.264 codec
+        *VIDEO_ENCODING,  # Use H.264 codec
         "-t", str(duration),  # Set the duration
         "-pix_fmt", "yuv420p",
         video_path
     ]
-    subprocess.run(command, check=True)
+    await run_command(command)
 
     return MP4File(video_path)
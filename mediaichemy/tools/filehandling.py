@@ -1,19 +1,30 @@
 from abc import ABC, abstractmethod
+from functools import cached_property
 import json
 import logging
 import os
 import random
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 import string
 from PIL import Image
 from typing import Any, Dict, Tuple
 import subprocess
 from mutagen.mp3 import MP3
+from mutagen.mp4 import Atoms
 import shutil
+import struct
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+# Blocking downloads share one connection pool
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=32))
+
 
 class Directory:
     """
@@ -76,7 +87,19 @@ class File(ABC):
 
         dir, self.name, self.extension = self.split_name(self.filepath)
         self.dir = Directory(dir).path
-        self.data = self.load() if os.path.isfile(self.filepath) else None
+
+    @cached_property
+    def data(self) -> Any:
+        """
+        The file's contents, loaded on first access.
+
+        Most files, such as videos, are only ever handled by their path,
+        so their contents are not read into memory unless asked for.
+
+        :return: Any
+            The loaded data, or None if the file does not exist.
+        """
+        return self.load() if os.path.isfile(self.filepath) else None
 
     @staticmethod
     def _is_url(path: str) -> bool:
@@ -95,15 +118,66 @@ class File(ABC):
         """
         Downloads a file from a URL to the specified destination.
 
+        The response is streamed to disk through a shared session, so
+        consecutive downloads reuse connections and large files are never
+        held in memory. It is written under a temporary name and moved into
+        place with os.replace once complete.
+
         :param url: str
             The URL of the file to download.
         :param destination: str
             The path where the file will be saved.
         """
-        response = requests.get(url)
-        response.raise_for_status()
-        with open(destination, 'wb') as handler:
-            handler.write(response.content)
+        partial_path = f"{destination}.part"
+        with _session.get(url, stream=True) as response:
+            response.raise_for_status()
+            try:
+                with open(partial_path, 'wb') as handler:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        handler.write(chunk)
+                os.replace(partial_path, destination)
+            except BaseException:
+                # Failed downloads must not leave a truncated file behind
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                raise
+        logger.info(f"Downloaded file from {url} to {destination}")
+
+    @staticmethod
+    async def _adownload_file(url: str, destination: str,
+                              client: httpx.AsyncClient) -> None:
+        """
+        Downloads a file from a URL to the specified destination
+        without blocking the event loop.
+
+        The response is streamed to disk in chunks, so large files are
+        never held in memory, and only moved to the destination once complete.
+
+        :param url: str
+            The URL of the file to download.
+        :param destination: str
+            The path where the file will be saved.
+        :param client: httpx.AsyncClient
+            The client used for the download, so pooled connections are reused.
+        """
+        request = client.build_request("GET", url)
+        # Media is served from third-party storage, so API credentials are never forwarded
+        request.headers.pop("Authorization", None)
+        response = await client.send(request, stream=True)
+        partial_path = f"{destination}.part"
+        try:
+            response.raise_for_status()
+            with open(partial_path, 'wb') as handler:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    handler.write(chunk)
+            os.replace(partial_path, destination)
+        except BaseException:
+            # Failed or cancelled downloads must not leave a truncated file behind
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        finally:
+            await response.aclose()
         logger.info(f"Downloaded file from {url} to {destination}")
 
     @staticmethod
@@ -171,6 +245,29 @@ class File(ABC):
         # Return a new instance of the same class with the updated path
         return type(self)(filepath=destination, output_path=self.output_path)
 
+    def move_to(self, destination: str) -> "File":
+        """
+        Moves the file to a different path and returns a new instance of the same class with the updated path.
+
+        The file is renamed with os.replace, so no data is copied and an
+        existing destination is swapped atomically.
+
+        :param destination: str
+            The path where the file will be moved.
+        :return: File
+            A new instance of the same class with the updated path.
+        :raises FileNotFoundError:
+            If the source file does not exist.
+        """
+        if not os.path.isfile(self.filepath):
+            raise FileNotFoundError(f"Source file does not exist: {self.filepath}")
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(self.filepath, destination)
+        logger.info(f"Moved file from {self.filepath} to {destination}")
+
+        return type(self)(filepath=destination, output_path=self.output_path)
+
 
 class JSONFile(File):
     """
@@ -236,6 +333,35 @@ class JPEGFile(File):
         return image
 
 
+def _movie_duration(filepath: str) -> float:
+    """
+    Reads the duration of an MP4 file from its movie header (mvhd).
+
+    This is the length of the whole movie, as reported by ffprobe, rather
+    than the length of its audio track, which is what mutagen reports.
+
+    :param filepath: str
+        The path of the MP4 file.
+    :return: float
+        The duration in seconds.
+    :raises ValueError:
+        If the header does not state a duration.
+    """
+    with open(filepath, 'rb') as f:
+        mvhd = Atoms(f).path(b"moov", b"mvhd")[-1]
+        ok, data = mvhd.read(f)
+    if not ok:
+        raise ValueError("Truncated movie header.")
+    # Version 1 headers use 64-bit times and durations
+    if data[0] == 1:
+        timescale, duration = struct.unpack(">IQ", data[20:32])
+    else:
+        timescale, duration = struct.unpack(">II", data[12:20])
+    if not timescale or not duration:
+        raise ValueError("The movie header does not state a duration.")
+    return duration / timescale
+
+
 class MP4File(File):
     """
     Handles MP4 file operations.
@@ -246,6 +372,7 @@ class MP4File(File):
     def __init__(self, filepath: str, output_path: str = None) -> None:
         super().__init__(filepath, output_path)
         self.validate_extension(self.filepath, ".mp4")
+        self._duration = None
 
     def save(self, data: bytes) -> None:
         """
@@ -275,9 +402,20 @@ class MP4File(File):
         """
         Gets the length of the video in seconds.
 
+        The length is read from the movie header, falling back to ffprobe
+        for files it cannot be read from, and remembered, since every edit
+        writes its result to a new file.
+
         :return: float
             The video length in seconds.
         """
+        if self._duration is not None:
+            return self._duration
+        try:
+            self._duration = _movie_duration(self.filepath)
+            return self._duration
+        except Exception as e:
+            logger.debug(f"Could not read video length from the MP4 header: {e}")
         try:
             # Use ffprobe to get the video duration
             result = subprocess.run(
@@ -293,8 +431,8 @@ class MP4File(File):
                 text=True
             )
             # Parse the duration from the output
-            duration = float(result.stdout.strip())
-            return duration
+            self._duration = float(result.stdout.strip())
+            return self._duration
         except Exception as e:
             logger.error(f"Error getting video length: {e}")
             raise
@@ -310,6 +448,7 @@ class MP3File(File):
     def __init__(self, filepath: str, output_path: str = None) -> None:
         super().__init__(filepath, output_path)
         self.validate_extension(self.filepath, ".mp3")
+        self._duration = None
 
     def save(self, data: bytes) -> None:
         """
@@ -339,14 +478,16 @@ class MP3File(File):
         """
         Gets the duration of the MP3 file in seconds.
 
+        The header is parsed once and the duration remembered.
+
         :return: float
             The MP3 duration in seconds.
         """
+        if self._duration is not None:
+            return self._duration
         try:
-            print(self.filepath)
-            audio = MP3(self.filepath)
-            print(audio)
-            return audio.info.length
+            self._duration = MP3(self.filepath).info.length
+            return self._duration
         except ImportError:
             logger.error("Mutagen library is required to get MP3 duration.")
             raise
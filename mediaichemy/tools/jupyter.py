@@ -10,6 +10,12 @@ import random
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+IDEA_HTML = ("<div style='padding: 10px; border: 1px solid #ccc; margin-bottom: 10px; "
+             "border-radius: 5px; background-color: #f9f9f9;'>"
+             "<h4 style='margin: 0;'>Idea {number}</h4>"
+             "{details}"
+             "</div>")
+
 
 def display_ideas(ideas: List[Dict]) -> List[Dict[str, widgets.Checkbox]]:
     """
@@ -23,9 +29,11 @@ def display_ideas(ideas: List[Dict]) -> List[Dict[str, widgets.Checkbox]]:
     """
     selection_widgets: List[Dict[str, widgets.Checkbox]] = []
     container = widgets.VBox()
+    # Children are set once at the end, since every assignment is synced to the front-end
+    children = []
 
     for i, idea in enumerate(ideas):
-        details_html = ""
+        details = []
         for key, value in idea.items():
             if key == "section" and isinstance(value, list):
                 # Special handling for section array with timing data
@@ -40,18 +48,10 @@ def display_ideas(ideas: List[Dict]) -> List[Dict[str, widgets.Checkbox]]:
                 value = ", ".join(map(str, value))
             else:
                 value = str(value)
-            details_html += (f"<p><strong>{key.capitalize()}"
-                             f":</strong><br>{value}</p>")
+            details.append(f"<p><strong>{key.capitalize()}:</strong><br>{value}</p>")
 
         idea_html = widgets.HTML(
-            value=(
-                f"<div style='padding: 10px; border: 1px solid #ccc;"
-                " margin-bottom: 10px; "
-                f"border-radius: 5px; background-color: #f9f9f9;'>"
-                f"<h4 style='margin: 0;'>Idea {i + 1}</h4>"
-                f"{details_html}"
-                f"</div>"
-            )
+            value=IDEA_HTML.format(number=i + 1, details="".join(details))
         )
 
         checkbox = widgets.Checkbox(
@@ -108,16 +108,16 @@ def display_ideas(ideas: List[Dict]) -> List[Dict[str, widgets.Checkbox]]:
             (language_checkboxes_container
                 .children) = ([language_checkboxes_label] +
                               language_checkboxes_widgets)
-            container.children += (idea_widget,
-                                   language_checkboxes_container)
+            children.extend((idea_widget, language_checkboxes_container))
         else:
-            container.children += (idea_widget,)
+            children.append(idea_widget)
 
         selection_widgets.append({"main_checkbox":
                                   checkbox,
                                   "language_checkboxes":
                                   language_checkboxes})
 
+    container.children = tuple(children)
     display(container)
     return selection_widgets
 
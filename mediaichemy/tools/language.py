@@ -1,6 +1,7 @@
+from functools import cache, lru_cache
 from pydantic.dataclasses import dataclass
 import langcodes
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import logging
 
 # Initialize logger
@@ -26,15 +27,27 @@ class Language:
         Initializes the Language object by resolving
         the input as a language code or name.
         """
-        if langcodes.tag_is_valid(self.language):
-            self.code = self.language
-            self.name = langcodes.Language.get(self.code).display_name()
-        else:
-            resolved_language = langcodes.find(self.language)
-            if not resolved_language:
-                raise ValueError(f"Invalid language input: {self.language}")
-            self.code = resolved_language.language
-            self.name = resolved_language.display_name()
+        self.code, self.name = _resolve_language(self.language)
+
+
+@lru_cache(maxsize=256)
+def _resolve_language(language: str) -> Tuple[str, str]:
+    """
+    Resolves a language code or name, remembering the inputs seen most recently.
+
+    :param language: str
+        The input language code or name.
+    :return: Tuple[str, str]
+        The language code and name.
+    :raises ValueError:
+        If the input is neither a valid code nor a known language name.
+    """
+    if langcodes.tag_is_valid(language):
+        return language, langcodes.Language.get(language).display_name()
+    resolved_language = langcodes.find(language)
+    if not resolved_language:
+        raise ValueError(f"Invalid language input: {language}")
+    return resolved_language.language, resolved_language.display_name()
 
 
 @dataclass
@@ -85,6 +98,25 @@ class Languages:
         return codes
 
 
+@cache
+def _get_languages(languages: tuple) -> Languages:
+    return Languages(list(languages))
+
+
+def get_languages(languages: List[str]) -> Languages:
+    """
+    Retrieves the Languages for a list of inputs, resolving each distinct list only once.
+
+    The returned object is shared between callers and should not be modified.
+
+    :param languages: List[str]
+        A list of input languages.
+    :return: Languages
+        The resolved languages.
+    """
+    return _get_languages(tuple(languages))
+
+
 @dataclass
 class LanguageTexts:
     """
@@ -107,10 +139,14 @@ class LanguageTexts:
         :return: str
             The text in the specified language.
         """
-        texts = [txt for txt in self.texts if language in txt]
-        if not texts:
-            raise ValueError(f"Language '{language}' not found in texts.")
-        return texts[0][language]
+        try:
+            return self.texts[language]
+        except KeyError:
+            raise ValueError(f"Language '{language}' not found in texts.") from None
 
     def _validate_text_dicts(self, text_dicts):
-        return [{Language(k).code: text_dicts[k]}for k in text_dicts.keys()]
+        # Keyed by resolved code; if two inputs resolve to the same code, the first one wins
+        texts = {}
+        for k, text in text_dicts.items():
+            texts.setdefault(Language(k).code, text)
+        return texts
@@ -1,49 +1,129 @@
 import ast
+import asyncio
 import json
 from io import StringIO
 import logging
+import subprocess
 import sys
-from functools import wraps
+from functools import lru_cache, wraps
 from inspect import signature
-from typing import get_type_hints, get_origin, get_args, Union
+from typing import Any, Callable, get_type_hints, get_origin, get_args, Union
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Only the end of a command's stderr is kept, which is where errors are reported
+STDERR_TAIL_BYTES = 4096
+# Start of every ffmpeg command: overwrite outputs, never read the keyboard
+# and only report errors, instead of formatting a banner and per-frame stats
+FFMPEG = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin", "-y"]
+# Decodes the JSON objects embedded in AI responses, one object at a time
+_JSON_DECODER = json.JSONDecoder()
+
 
 def validate_types(func):
     """
     Decorator to validate function argument types.
 
+    On the first call the type hints are resolved and compiled into a
+    straight-line checker with the function's own signature, so later calls
+    only run one isinstance check per argument.
+
     :param func: Callable
         The function to validate.
     :return: Callable
         The wrapped function with type validation.
     """
+    sig = signature(func)
+    # Compiled on first call, so hints may refer to names defined after decoration
+    check = None
+
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        # Get the function's signature and type hints
-        sig = signature(func)
-        type_hints = get_type_hints(func)
-
-        # Bind the arguments to the signature
-        bound_args = sig.bind(self, *args, **kwargs)
-        bound_args.apply_defaults()
-
-        # Validate each argument against its type hint
-        for arg_name, arg_value in bound_args.arguments.items():
-            if arg_name in type_hints:
-                expected_type = type_hints[arg_name]
-                if not _validate_type(arg_value, expected_type):
-                    raise TypeError(
-                        f"Argument '{arg_name}' must be of "
-                        f"type {expected_type}, but got {type(arg_value)}."
-                    )
-
+        nonlocal check
+        if check is None:
+            check = _compile_checker(sig, get_type_hints(func))
+        check(self, *args, **kwargs)
         return func(self, *args, **kwargs)
     return wrapper
 
 
+def _type_error(arg_name, expected_type, arg_value):
+    """
+    Raises the error reported for an argument of the wrong type.
+
+    :param arg_name: str
+        The name of the argument.
+    :param expected_type: Any
+        The type hint of the argument.
+    :param arg_value: Any
+        The value that was passed.
+    :raises TypeError:
+        Always.
+    """
+    raise TypeError(
+        f"Argument '{arg_name}' must be of "
+        f"type {expected_type}, but got {type(arg_value)}."
+    )
+
+
+def _compile_checker(sig, type_hints: dict) -> Callable:
+    """
+    Builds a function that checks arguments against their type hints.
+
+    The function is generated with the same parameters as the signature, so
+    Python itself binds the arguments and fills in defaults. Plain classes and
+    unions of them become inline isinstance checks, other hints call their
+    validator. Signatures with positional-only, *args or **kwargs parameters
+    are checked by binding the arguments instead.
+
+    :param sig: inspect.Signature
+        The signature of the decorated function.
+    :param type_hints: dict
+        The resolved type hints of the decorated function.
+    :return: Callable
+        A function taking the same arguments, raising TypeError on a mismatch.
+    """
+    hints = {name: hint for name, hint in type_hints.items() if name in sig.parameters}
+    parameters = list(sig.parameters.values())
+    if any(p.kind not in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) for p in parameters):
+        validators = {name: _type_validator(hint) for name, hint in hints.items()}
+
+        def check(*args, **kwargs):
+            bound_args = sig.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            for arg_name, arg_value in bound_args.arguments.items():
+                if arg_name in validators and not validators[arg_name](arg_value):
+                    _type_error(arg_name, hints[arg_name], arg_value)
+        return check
+
+    namespace = {"_defaults": [p.default for p in parameters], "_hints": hints,
+                 "_type_error": _type_error}
+    params, lines = [], []
+    for i, p in enumerate(parameters):
+        if p.kind is p.KEYWORD_ONLY and "*" not in params:
+            params.append("*")
+        params.append(p.name if p.default is p.empty else f"{p.name}=_defaults[{i}]")
+        if p.name not in hints:
+            continue
+        hint = hints[p.name]
+        if get_origin(hint) is None and isinstance(hint, type):
+            namespace[f"_type_{i}"] = hint
+        elif get_origin(hint) is Union and all(get_origin(arg) is None and isinstance(arg, type)
+                                               for arg in get_args(hint)):
+            namespace[f"_type_{i}"] = get_args(hint)
+        if f"_type_{i}" in namespace:
+            test = f"isinstance({p.name}, _type_{i})"
+        else:
+            namespace[f"_valid_{i}"] = _type_validator(hint)
+            test = f"_valid_{i}({p.name})"
+        lines.append(f"    if not {test}:\n"
+                     f"        _type_error({p.name!r}, _hints[{p.name!r}], {p.name})")
+    source = f"def check({', '.join(params)}):\n" + ("\n".join(lines) or "    pass")
+    exec(source, namespace)
+    return namespace["check"]
+
+
 def _validate_type(value, expected_type):
     """
     Validates a value against an expected type.
@@ -55,55 +135,50 @@ def _validate_type(value, expected_type):
     :return: bool
         True if the value matches the expected type, False otherwise.
     """
+    return _type_validator(expected_type)(value)
+
+
+@lru_cache(maxsize=None)
+def _type_validator(expected_type) -> Callable[[Any], bool]:
+    """
+    Builds a function that checks values against an expected type.
+
+    The type is taken apart once per hint, instead of on every check.
+
+    :param expected_type: Any
+        The expected type.
+    :return: Callable[[Any], bool]
+        A function returning True if a value matches the expected type.
+    """
     origin = get_origin(expected_type)  # Get the base type (e.g., list, dict)
     args = get_args(expected_type)  # Get the type arguments (e.g., str, int)
 
     if origin is None:
         # If there's no origin, it's a simple type (e.g., int, str)
-        return isinstance(value, expected_type)
+        return lambda value: isinstance(value, expected_type)
 
-    if origin in {list, tuple}:
+    if origin in {list, tuple} and args:
         # Validate list or tuple elements
-        if not isinstance(value, origin):
-            return False
-        if args:
-            return all(_validate_type(item, args[0]) for item in value)
+        is_valid_item = _type_validator(args[0])
+        return lambda value: isinstance(value, origin) and all(is_valid_item(item) for item in value)
 
-    if origin is dict:
+    if origin is dict and args:
         # Validate dictionary keys and values
-        if not isinstance(value, origin):
-            return False
-        if args:
-            key_type, value_type = args
-            return all(
-                _validate_type(k, key_type) and _validate_type(v, value_type)
-                for k, v in value.items()
-            )
+        is_valid_key, is_valid_value = map(_type_validator, args)
+        return lambda value: isinstance(value, origin) and all(
+            is_valid_key(k) and is_valid_value(v) for k, v in value.items()
+        )
 
     if origin is Union:
         # Validate Union types (e.g., Union[int, str])
-        return any(_validate_type(value, arg) for arg in args)
+        if all(get_origin(arg) is None for arg in args):
+            # A union of plain classes is a single isinstance check against all of them
+            return lambda value: isinstance(value, args)
+        arms = tuple(_type_validator(arg) for arg in args)
+        return lambda value: any(is_valid(value) for is_valid in arms)
 
     # Add more cases for other generic types if needed
-    return isinstance(value, origin)
-
-
-def RawJSONDecoder(index):
-    """
-    Creates a custom JSON decoder starting at a specific index.
-
-    :param index: int
-        The starting index for decoding.
-    :return: JSONDecoder
-        A custom JSON decoder class.
-    """
-    class _RawJSONDecoder(json.JSONDecoder):
-        end = None
-
-        def decode(self, s, *_):
-            data, self.__class__.end = self.raw_decode(s, index)
-            return data
-    return _RawJSONDecoder
+    return lambda value: isinstance(value, origin)
 
 
 def extract_json(s, index=0):
@@ -126,10 +201,11 @@ def extract_json(s, index=0):
 
     while (index := s.find('{', index)) != -1:
         try:
-            yield json.loads(s, cls=(decoder := RawJSONDecoder(index)))
-            index = decoder.end
+            data, index = _JSON_DECODER.raw_decode(s, index)
         except json.JSONDecodeError:
             index += 1
+            continue
+        yield data
 
 
 class Capturing(list):
@@ -151,7 +227,97 @@ class Capturing(list):
         sys.stdout = self._stdout
 
 
+async def _read_tail(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """
+    Reads a stream to its end, keeping only its last bytes.
+
+    :param stream: asyncio.StreamReader
+        The stream to read.
+    :param limit: int
+        How many bytes to keep.
+    :return: bytes
+        The last bytes of the stream.
+    """
+    tail = b""
+    while chunk := await stream.read(1 << 16):
+        tail = (tail + chunk)[-limit:]
+    return tail
+
+
+async def _feed(stream: asyncio.StreamWriter, data: bytes) -> None:
+    """
+    Writes data to a process's stdin and closes it.
+
+    :param stream: asyncio.StreamWriter
+        The process's stdin.
+    :param data: bytes
+        The data to write.
+    """
+    try:
+        stream.write(data)
+        await stream.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # The process exited without reading all of it; its exit status tells why
+        pass
+    finally:
+        stream.close()
+
+
+async def run_command(command: list, input: bytes = None) -> str:
+    """
+    Runs an external command, such as ffmpeg, without blocking the event loop.
+
+    The command's stderr is drained as it is written, but only its end is
+    kept, so long runs do not pile up their progress output in memory.
+
+    :param command: list
+        The program and its arguments.
+    :param input: bytes, optional
+        Data written to the command's stdin, which is otherwise closed.
+    :return: str
+        The end of what the command wrote to stderr.
+    :raises subprocess.CalledProcessError:
+        If the command exits with a non-zero status.
+    """
+    process = await asyncio.create_subprocess_exec(*command,
+                                                   stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+                                                   stdout=subprocess.DEVNULL,
+                                                   stderr=subprocess.PIPE)
+    try:
+        if input is None:
+            stderr = await _read_tail(process.stderr, STDERR_TAIL_BYTES)
+        else:
+            # stdin is fed while stderr is read, so neither pipe can fill up and stall the command
+            stderr, _ = await asyncio.gather(_read_tail(process.stderr, STDERR_TAIL_BYTES),
+                                             _feed(process.stdin, input))
+        await process.wait()
+    except asyncio.CancelledError:
+        # A cancelled caller must not leave the process running in the background
+        process.kill()
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        logger.error(stderr.decode(errors="replace"))
+        raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr)
+    return stderr.decode(errors="replace")
+
+
 def log(func):
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            logger.debug(f"Applying: {func.__name__}")
+            logger.debug(f"Arguments: args={args}, kwargs={kwargs}")
+            try:
+                result = await func(*args, **kwargs)
+                logger.debug(f"Method {func.__name__} returned: {result}")
+                return result
+            except Exception as e:
+                logger.error(f"Method {func.__name__} raised an exception: {e}")
+                raise
+
+        return async_wrapper
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         # Log the method name and arguments
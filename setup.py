@@ -13,6 +13,7 @@ setup(
     packages=find_packages(exclude=["tests*", "htmlcov*"]),
     include_package_data=True,
     install_requires=[
+        "aiolimiter==1.3.0",
         "elevenlabs==1.56.0",
         "httpx==0.28.1",
         "ipython==9.0.2",
@@ -20,6 +21,7 @@ setup(
         "langcodes==3.5.0",
         "matplotlib==3.10.1",
         "mutagen==1.47.0",
+        "orjson==3.10.16",
         "Pillow==11.1.0",
         "pydantic==2.11.3",
         "pysubs2==1.8.0",
@@ -27,7 +29,6 @@ setup(
         "requests==2.32.3",
         "runware==0.4.8",
         "setuptools==78.1.0",
-        "toml==0.10.2",
         "yt-dlp==2025.3.31",
         "youtube-transcript-api==1.0.3"
     ],
@@ -39,7 +40,7 @@ setup(
             "flake8==6.1.0",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.11",
     classifiers=[
         "Development Status :: 4 - Beta",
         "Programming Language :: Python :: 3",
@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from mediaichemy.ai.request import ai_request
+from mediaichemy.ai.request import _get_provider, ai_request, close_providers, gather_media
 from mediaichemy.tools.filehandling import MP4File, JPEGFile, MP3File
 
 
@@ -59,3 +60,88 @@ async def test_ai_request_speech(mock_providers, copy_mock_short_video):
         output_path="tests/resources/temp_content/speech.mp3")
     assert isinstance(result, MP3File)
     assert result.filepath == "tests/resources/temp_content/speech.mp3"
+
+
+@pytest.mark.asyncio
+async def test_providers_are_cached(mock_providers):
+    """
+    Test that ai_request reuses one provider instance per media type until they are closed.
+    """
+    provider = _get_provider("text", "openrouter")
+    await ai_request(media="text", prompt="Generate some text")
+    assert _get_provider("text", "openrouter") is provider
+    assert _get_provider("image", "runware") is not provider
+
+    await close_providers()
+    assert _get_provider("text", "openrouter") is not provider
+    await close_providers()
+
+
+@pytest.mark.asyncio
+async def test_providers_follow_config_changes(temporary_configs_file):
+    """
+    Test that providers are created again with the new settings after configs.toml changes.
+    """
+    temporary_configs_file('[ai.image.runware]\nmodel = "runware:100@1"\n')
+    provider = _get_provider("image", "runware")
+    assert provider.model == "runware:100@1"
+    assert _get_provider("image", "runware") is provider
+
+    temporary_configs_file('[ai.image.runware]\nmodel = "runware:101@1"\napi_key = "new_key"\n')
+    reloaded = _get_provider("image", "runware")
+    assert reloaded is not provider
+    assert (reloaded.model, reloaded.api_key) == ("runware:101@1", "new_key")
+    await close_providers()
+
+
+def test_unsupported_provider():
+    """
+    Test that asking for an unknown provider raises a ValueError.
+    """
+    with pytest.raises(ValueError):
+        _get_provider("text", "unknown")
+    with pytest.raises(ValueError):
+        _get_provider("image", "openrouter")
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_coalesced(mock_providers):
+    """
+    Test that identical concurrent requests reach the provider once and share the result.
+    """
+    first, second, other = await asyncio.gather(ai_request(media="text", prompt="Generate some text"),
+                                                ai_request(media="text", prompt="Generate some text"),
+                                                ai_request(media="text", prompt="Generate other text"))
+    assert first == second
+    assert mock_providers["mock_openrouter"].call_count == 2
+
+    await ai_request(media="text", prompt="Generate some text")
+    assert mock_providers["mock_openrouter"].call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_requests_with_unhashable_arguments_are_not_coalesced(mock_providers):
+    """
+    Test that requests with list or dict arguments still reach the provider.
+    """
+    await asyncio.gather(ai_request(media="text", prompt="Generate some text", stop=["\n"]),
+                         ai_request(media="text", prompt="Generate some text", stop=["\n"]))
+    assert mock_providers["mock_openrouter"].call_count == 2
+    assert mock_providers["mock_openrouter"].call_args.kwargs["stop"] == ["\n"]
+
+
+@pytest.mark.asyncio
+async def test_gather_media(mock_providers, copy_mock_short_video):
+    """
+    Test that independent requests of different media are all made and returned in order.
+    """
+    image, speech = await gather_media([
+        {"media": "image", "prompt": "Generate an image",
+         "output_path": "tests/resources/temp_content/image.jpg"},
+        {"media": "speech", "prompt": "Generate speech",
+         "output_path": "tests/resources/temp_content/speech.mp3"},
+    ])
+    assert isinstance(image, JPEGFile)
+    assert isinstance(speech, MP3File)
+    mock_providers["mock_runware"].assert_called_once()
+    mock_providers["mock_elevenlabs"].assert_called_once()
@@ -1,6 +1,8 @@
-from mediaichemy.aichemist import mediaAIChemist
+from mediaichemy.aichemist import CONTENT_TYPES, mediaAIChemist
 from mediaichemy.content.short_video import ShortVideoCreator
 import pytest
+import asyncio
+from unittest.mock import patch
 
 
 def test_initialization():
@@ -21,6 +23,10 @@ def test_invalid_content_type():
         assert False, "Expected ValueError not raised"
 
 
+def test_content_types():
+    assert CONTENT_TYPES == {"short_video", "music_video"}
+
+
 @pytest.mark.asyncio
 async def test_idea_generation():
     aichemist = mediaAIChemist(content_type="short_video")
@@ -28,3 +34,31 @@ async def test_idea_generation():
     ideas = await aichemist.generate_ideas()
     assert isinstance(ideas, list), "Ideas should be a list"
     assert all(isinstance(idea, dict) for idea in ideas), "All ideas should be dictionaries"
+
+
+@pytest.mark.asyncio
+async def test_generated_ideas_are_not_copied():
+    aichemist = mediaAIChemist(content_type="short_video")
+    parsed = {"texts": {}, "image_prompt": "", "captions": {}, "languages": []}
+
+    with patch("mediaichemy.content.short_video.extract_json", return_value=iter([parsed])):
+        ideas = await aichemist.generate_ideas()
+    assert ideas[0] is parsed
+
+
+@pytest.mark.asyncio
+async def test_contents_are_created_concurrently():
+    aichemist = mediaAIChemist(content_type="short_video")
+    running = []
+    both_running = asyncio.Event()
+
+    async def create(content):
+        running.append(content)
+        if len(running) == 2:
+            both_running.set()
+        await both_running.wait()
+        return f"{content}_media"
+
+    with patch.object(ShortVideoCreator, "create", side_effect=create):
+        media = await asyncio.wait_for(aichemist.content_creator.create_batch(["a", "b"], max_concurrent=2), 5)
+    assert media == ["a_media", "b_media"]
@@ -0,0 +1,102 @@
+import pytest
+import tomllib
+from unittest.mock import patch
+from mediaichemy.configs import DEFAULT_CONFIG_PATH, ConfigManager, _read_toml, get_config_manager
+
+
+def test_config_manager_is_shared(temporary_configs_file):
+    """
+    Test that the configuration is parsed once and reloaded only when configs.toml changes.
+    """
+    temporary_configs_file('[audio.silence]\nduration = 1.0\n')
+    manager = get_config_manager()
+    assert get_config_manager() is manager
+    assert manager.get('audio.silence.duration') == 1.0
+
+    temporary_configs_file('[audio.silence]\nduration = 2.25\n')
+    reloaded = get_config_manager()
+    assert reloaded is not manager
+    assert reloaded.get('audio.silence.duration') == 2.25
+
+
+def test_config_file_is_parsed_once(temporary_configs_file):
+    """
+    Test that an unchanged TOML file is not parsed again and callers get independent copies.
+    """
+    path = temporary_configs_file('[audio.silence]\nduration = 1.0\n')
+    with patch("mediaichemy.configs.tomllib.loads", wraps=tomllib.loads) as mock_load:
+        first = _read_toml(path)
+        first['audio']['silence']['duration'] = 5.0
+        assert _read_toml(path) == {'audio': {'silence': {'duration': 1.0}}}
+    mock_load.assert_called_once()
+
+
+def test_config_lookups_are_memoized():
+    """
+    Test that repeated lookups are answered without walking the configuration again.
+    """
+    manager = get_config_manager()
+    provider = manager.get(table='ai.text', key='provider')
+    with patch.object(manager, "_traverse_config") as mock_traverse:
+        assert manager.get(table='ai.text', key='provider') == provider
+    mock_traverse.assert_not_called()
+
+
+def test_merge_dicts_prioritizes_override():
+    """
+    Test that nested tables are merged key by key without modifying the defaults.
+    """
+    manager = get_config_manager()
+    base = {'ai': {'text': {'provider': 'openrouter', 'model': 'auto'}}, 'audio': {'volume': 1}}
+    override = {'ai': {'text': {'model': 'deepseek'}}, 'audio': 2}
+    merged = manager._merge_dicts(base, override)
+    assert merged == {'ai': {'text': {'provider': 'openrouter', 'model': 'deepseek'}}, 'audio': 2}
+    assert base['ai']['text']['model'] == 'auto'
+
+
+def test_config_is_flattened():
+    """
+    Test that tables and values are reachable by their dotted paths after loading.
+    """
+    manager = get_config_manager()
+    assert manager._flat['ai.text'] is manager.config['ai']['text']
+    assert manager._flat['ai.text.provider'] == manager.config['ai']['text']['provider']
+    assert manager.get('ai.text.provider') == manager.get(table='ai.text', key='provider')
+    assert manager.get('ai.text.missing.api_key') == {}
+    with pytest.raises(ValueError):
+        manager.get(key='ai.text.missing_key')
+
+
+def test_shared_manager_skips_config_search(temporary_configs_file):
+    """
+    Test that the shared manager reuses the configs.toml path it already found.
+    """
+    path = temporary_configs_file('[audio.silence]\nduration = 3.5\n')
+    with patch("mediaichemy.configs.ConfigManager._find_config_file") as mock_find:
+        manager = get_config_manager()
+    mock_find.assert_not_called()
+    assert manager.config_file_path == path
+
+
+def test_shared_manager_without_config_file_skips_search():
+    """
+    Test that the shared manager falls back to the defaults without searching for configs.toml again.
+    """
+    with patch("mediaichemy.configs._shared_manager", None), \
+         patch("mediaichemy.configs._shared_manager_key", None), \
+         patch("mediaichemy.configs.ConfigManager._find_config_file") as mock_find:
+        manager = get_config_manager()
+        assert get_config_manager() is manager
+    mock_find.assert_not_called()
+    assert manager.config_file_path == DEFAULT_CONFIG_PATH
+
+
+def test_defaults_only_config_is_not_merged():
+    """
+    Test that the defaults are used as-is when there is no user configuration file.
+    """
+    with patch.object(ConfigManager, "_merge_dicts") as mock_merge:
+        manager = ConfigManager(config_file_path=DEFAULT_CONFIG_PATH)
+    mock_merge.assert_not_called()
+    assert manager.config == manager.defaults
+    assert manager.config is not manager.defaults
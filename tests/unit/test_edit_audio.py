@@ -0,0 +1,55 @@
+import os
+import subprocess
+import pytest
+from unittest.mock import AsyncMock, patch
+from mediaichemy.tools import edit_audio
+
+
+@pytest.mark.asyncio
+async def test_youtube_download_does_not_block(tmp_path):
+    """
+    Test that yt-dlp is awaited as an asynchronous subprocess.
+    """
+    output_path = str(tmp_path / "background.mp3")
+    with patch("mediaichemy.tools.edit_audio.YOUTUBE_CACHE_DIR", str(tmp_path / "cache")), \
+         patch("mediaichemy.tools.edit_audio.run_command", AsyncMock(return_value="")) as mock_run:
+        audio = await edit_audio.download_from_youtube(["https://youtu.be/a"], output_path=output_path)
+
+    command = mock_run.call_args.args[0]
+    assert command[0] == "yt-dlp"
+    assert command[-1] == "https://youtu.be/a"
+    assert audio.filepath == output_path
+
+
+@pytest.mark.asyncio
+async def test_youtube_download_is_cached(tmp_path):
+    """
+    Test that a track already downloaded from the same URL is copied from the cache.
+    """
+    def download(command):
+        with open(command[command.index("-o") + 1], "wb") as f:
+            f.write(b"track")
+        return ""
+
+    with patch("mediaichemy.tools.edit_audio.YOUTUBE_CACHE_DIR", str(tmp_path / "cache")), \
+         patch("mediaichemy.tools.edit_audio.run_command", AsyncMock(side_effect=download)) as mock_run:
+        await edit_audio.download_from_youtube(["https://youtu.be/a"], output_path=str(tmp_path / "first.mp3"))
+        second = await edit_audio.download_from_youtube(["https://youtu.be/a"],
+                                                        output_path=str(tmp_path / "second.mp3"))
+
+    mock_run.assert_awaited_once()
+    with open(second.filepath, "rb") as f:
+        assert f.read() == b"track"
+
+
+@pytest.mark.asyncio
+async def test_failed_youtube_download_raises(tmp_path):
+    """
+    Test that a download exiting with an error raises instead of returning a missing file.
+    """
+    error = subprocess.CalledProcessError(1, ["yt-dlp"], stderr=b"ERROR: Video unavailable")
+    with patch("mediaichemy.tools.edit_audio.YOUTUBE_CACHE_DIR", str(tmp_path / "cache")), \
+         patch("mediaichemy.tools.edit_audio.run_command", AsyncMock(side_effect=error)):
+        with pytest.raises(subprocess.CalledProcessError):
+            await edit_audio.download_from_youtube(["https://youtu.be/a"], output_path=str(tmp_path / "a.mp3"))
+    assert not os.path.exists(tmp_path / "cache")
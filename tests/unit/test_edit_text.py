@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+import pysubs2
+from unittest.mock import AsyncMock, patch
+from mediaichemy.configs import get_config_manager
+from mediaichemy.tools.edit_text import Subtitles
+from mediaichemy.tools.filehandling import MP4File
+
+
+def test_generate_subtitles_splits_on_punctuation():
+    """
+    Test that sentences follow each other and share the duration by their length.
+    """
+    text = "Hello there, world.  How are you?"
+    subtitles = Subtitles(text=text).generate_subtitles(duration=len(text))
+
+    assert [subtitle["text"] for subtitle in subtitles] == ["Hello there,", "world.", "How are you?"]
+    assert [(subtitle["start"], subtitle["end"]) for subtitle in subtitles] == [(0, 12.0), (12.0, 18.0),
+                                                                                (18.0, 30.0)]
+
+
+def test_generate_subtitles_needs_a_duration():
+    """
+    Test that a non-positive duration is rejected.
+    """
+    with pytest.raises(ValueError):
+        Subtitles(text="Hello.").generate_subtitles(duration=0)
+
+
+def test_subtitle_styles_are_built_once():
+    """
+    Test that every subtitle file gets its own copy of the cached alignment styles.
+    """
+    configs = get_config_manager().get(table='subtitles')
+    first, second = Subtitles._load_subtitle_configs(), Subtitles._load_subtitle_configs()
+
+    assert first.keys() == second.keys()
+    for alignment in first:
+        assert first[alignment].styles["Default"] == second[alignment].styles["Default"]
+        assert first[alignment].styles["Default"] is not second[alignment].styles["Default"]
+        assert first[alignment].styles["Default"].alignment == alignment
+        style = first[alignment].styles["Default"]
+        assert (style.marginl, style.marginr, style.marginv) == (configs['margin_l'], configs['margin_r'],
+                                                                 configs['margin_v'])
+
+
+def test_ass_subtitles_have_every_event(tmp_path):
+    """
+    Test that each alignment's .ass file holds every subtitle, timed in whole milliseconds.
+    """
+    subtitles = [{"start": 0, "end": 1.2345, "text": "Hello,"}, {"start": 1.2345, "end": 2.5, "text": "world."}]
+    sub_paths = Subtitles._create_ass_subtitles(subtitles, str(tmp_path / "video.ass"))
+
+    assert sub_paths
+    for sub_path in sub_paths:
+        events = pysubs2.load(sub_path).events
+        assert [event.text for event in events] == ["Hello,", "world."]
+        assert events[0].end == 1230
+
+
+@pytest.mark.asyncio
+async def test_alignments_are_burned_concurrently(tmp_path):
+    """
+    Test that every alignment is rendered by its own concurrent ffmpeg run and its .ass file removed.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    running, peak = 0, 0
+
+    async def run_command(command):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    subtitles = [{"start": 0, "end": 1.0, "text": "Hello."}]
+    with patch("mediaichemy.tools.edit_text.run_command", AsyncMock(side_effect=run_command)) as mock_run:
+        subtitled = await Subtitles(text="Hello.", video=video).add_subtitles(subtitles)
+
+    assert peak == mock_run.await_count == len(subtitled) > 1
+    assert [v.filepath for v in subtitled] == [call.args[0][-1] for call in mock_run.call_args_list]
+    assert not list(tmp_path.glob("*.ass"))
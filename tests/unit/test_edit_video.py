@@ -0,0 +1,190 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from mediaichemy.tools import edit_video
+from mediaichemy.tools.filehandling import MP4File
+from mediaichemy.tools.utils import FFMPEG
+
+
+@pytest.mark.asyncio
+async def test_loop_extension_encodes_only_the_boomerang(tmp_path):
+    """
+    Test that the loop extension encodes the boomerang once and copies its repetitions.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run, \
+         patch.object(MP4File, "get_duration", return_value=6.0):
+        extended = await edit_video.extend_to_duration(video, target_duration=12.5, method="loop")
+
+    boomerang, loop = (call.args[0] for call in mock_run.call_args_list)
+    assert boomerang[:len(FFMPEG)] == FFMPEG
+    assert "reverse" in boomerang[boomerang.index("-filter_complex") + 1]
+    assert boomerang[-1] == str(tmp_path / "video_boomerang.mp4")
+    assert loop[loop.index("-i") + 1] == str(tmp_path / "video_boomerang.mp4")
+    assert loop[loop.index("-t") + 1] == "12.5"
+    assert loop[loop.index("-c") + 1] == "copy"
+    assert extended.filepath == str(tmp_path / "video_loop.mp4")
+
+
+@pytest.mark.asyncio
+async def test_concat_repeats_with_stream_loop(tmp_path):
+    """
+    Test that repeating a video loops the input instead of writing a concat list.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run:
+        repeated = await edit_video.concat_videos(video, n=3)
+
+    command = mock_run.call_args.args[0]
+    assert command[command.index("-stream_loop") + 1] == "2"
+    assert not (tmp_path / "concat_list.txt").exists()
+    assert repeated.filepath == str(tmp_path / "video_concat.mp4")
+
+
+@pytest.mark.asyncio
+async def test_ai_extension_is_cut_while_concatenating(tmp_path):
+    """
+    Test that AI extensions are cut to the target duration by the concatenation itself.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    extension = MP4File(str(tmp_path / "video_ai_extension0.mp4"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run, \
+         patch("mediaichemy.tools.edit_video.ai_request", AsyncMock(return_value=extension)), \
+         patch.object(MP4File, "get_duration", return_value=6.0):
+        extended = await edit_video.extend_to_duration(video, target_duration=10.0, method="ai")
+
+    commands = [call.args[0] for call in mock_run.call_args_list]
+    assert [command[-1] for command in commands] == [str(tmp_path / "video_lastframe.jpg"),
+                                                     str(tmp_path / "video_concat.mp4")]
+    assert commands[-1][commands[-1].index("-t") + 1] == "10.0"
+    assert extended.filepath == str(tmp_path / "video_concat.mp4")
+
+
+@pytest.mark.asyncio
+async def test_audio_section_is_read_while_muxing(tmp_path):
+    """
+    Test that a section of the audio is selected by input options instead of a separate cut.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    audio = MagicMock(filepath=str(tmp_path / "audio.mp3"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run:
+        await edit_video.add_audio_to_video(video, audio, start=12.0, duration=8.5)
+
+    command = mock_run.call_args.args[0]
+    audio_input = command.index(audio.filepath)
+    assert command[audio_input - 5:audio_input] == ["-ss", "12.0", "-t", "8.5", "-i"]
+
+
+@pytest.mark.asyncio
+async def test_loop_extension_only_cuts_long_videos(tmp_path):
+    """
+    Test that a video already longer than the target is cut without the boomerang re-encode.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run, \
+         patch.object(MP4File, "get_duration", return_value=20.0):
+        extended = await edit_video.extend_to_duration(video, target_duration=12.5, method="loop")
+
+    command = mock_run.call_args.args[0]
+    assert "-filter_complex" not in command
+    assert command[command.index("-c") + 1] == "copy"
+    assert extended.filepath == str(tmp_path / "video_trim.mp4")
+
+
+@pytest.mark.asyncio
+async def test_unknown_extension_method_is_rejected(tmp_path):
+    """
+    Test that an unknown extension method raises instead of trimming the video.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run:
+        with pytest.raises(ValueError, match="Unknown extension method: lop"):
+            await edit_video.extend_to_duration(video, target_duration=12.5, method="lop")
+    mock_run.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_final_render_is_a_single_ffmpeg_call(tmp_path):
+    """
+    Test that padding, background mixing and muxing are done by one ffmpeg run.
+    """
+    video = MP4File(str(tmp_path / "video_loop.mp4"))
+    speech = MagicMock(filepath=str(tmp_path / "en_speech.mp3"))
+    speech.get_duration.return_value = 4.0
+    background = MagicMock(filepath=str(tmp_path / "background.mp3"))
+    background.get_duration.return_value = 60.0
+    output_path = str(tmp_path / "en_edited_video.mp4")
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run:
+        rendered = await edit_video.render_final(video, speech, output_path=output_path, silence=6,
+                                                 background=background, relative_volume=0.7)
+
+    mock_run.assert_awaited_once()
+    command = mock_run.call_args.args[0]
+    background_input = command.index(background.filepath)
+    assert command[background_input - 2:background_input] == ["10.0", "-i"]
+    graph = command[command.index("-filter_complex") + 1]
+    assert "apad=pad_dur=6" in graph and "amix" in graph
+    assert command[command.index("-c:v") + 1] == "copy"
+    assert rendered.filepath == output_path
+
+
+@pytest.mark.asyncio
+async def test_ai_continuations_are_requested_concurrently(tmp_path, temporary_configs_file):
+    """
+    Test that continuations of the same frame are requested together, never more than needed.
+    """
+    temporary_configs_file('[video]\nextension_concurrency = 2\n')
+    video = MP4File(str(tmp_path / "video.mp4"))
+    in_flight, peak = 0, 0
+
+    async def ai_request(media, prompt, input_path, output_path):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return MP4File(output_path)
+
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run, \
+         patch("mediaichemy.tools.edit_video.ai_request", AsyncMock(side_effect=ai_request)) as mock_ai, \
+         patch.object(MP4File, "get_duration", return_value=6.0):
+        await edit_video.extend_to_duration(video, target_duration=20.0, method="ai", prompt="waves")
+
+    assert peak == 2
+    assert mock_ai.await_count == 3
+    lastframes = [call.args[0][-1] for call in mock_run.call_args_list if call.args[0][-1].endswith(".jpg")]
+    assert lastframes == [str(tmp_path / "video_lastframe.jpg"),
+                          str(tmp_path / "video_ai_extension1_lastframe.jpg")]
+
+
+@pytest.mark.asyncio
+async def test_concat_list_is_piped(tmp_path):
+    """
+    Test that the concat list is fed through stdin instead of written to disk.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    extension = MP4File(str(tmp_path / "video_ai_extension0.mp4"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run:
+        await edit_video.concat_videos(video, videos_to_add=[extension])
+
+    command = mock_run.call_args.args[0]
+    assert command[command.index("-i") + 1] == "pipe:0"
+    assert mock_run.call_args.kwargs["input"] == (f"file '{video.filepath}'\n"
+                                                  f"file '{extension.filepath}'\n").encode()
+    assert not (tmp_path / "concat_list.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_last_frame_is_written_once(tmp_path):
+    """
+    Test that only the last frame of the video is encoded to the image.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    with patch("mediaichemy.tools.edit_video.run_command", AsyncMock()) as mock_run:
+        frame = await edit_video.extract_last_frame(video)
+
+    command = mock_run.call_args.args[0]
+    assert command[command.index("-vf") + 1] == "reverse"
+    assert command[command.index("-frames:v") + 1] == "1"
+    assert "-update" not in command
+    assert frame.filepath == str(tmp_path / "video_lastframe.jpg")
@@ -0,0 +1,144 @@
+import httpx
+import pytest
+from mutagen.mp3 import MP3
+from unittest.mock import MagicMock, patch
+from mediaichemy.tools.filehandling import File, MP3File, MP4File
+
+
+@pytest.mark.asyncio
+async def test_adownload_file_streams_to_disk(tmp_path):
+    """
+    Test that an async download writes the full response body to the destination.
+    """
+    body = b"x" * 200_000
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    destination = str(tmp_path / "video.mp4")
+    async with httpx.AsyncClient(transport=transport) as client:
+        await File._adownload_file("https://cdn.example.com/video.mp4", destination, client=client)
+
+    with open(destination, "rb") as f:
+        assert f.read() == body
+
+
+@pytest.mark.asyncio
+async def test_adownload_file_raises_on_http_error(tmp_path):
+    """
+    Test that an async download raises when the server answers with an error.
+    """
+    transport = httpx.MockTransport(lambda request: httpx.Response(404))
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await File._adownload_file("https://cdn.example.com/missing.mp4",
+                                       str(tmp_path / "missing.mp4"), client=client)
+    assert not (tmp_path / "missing.mp4").exists()
+
+
+@pytest.mark.asyncio
+async def test_adownload_file_keeps_existing_file_on_failure(tmp_path):
+    """
+    Test that a failed download leaves a file already at the destination untouched.
+    """
+    destination = tmp_path / "video.mp4"
+    destination.write_bytes(b"previous")
+
+    async def stream():
+        yield b"partial"
+        raise httpx.ReadError("connection lost")
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=stream()))
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(httpx.ReadError):
+            await File._adownload_file("https://cdn.example.com/video.mp4", str(destination), client=client)
+    assert destination.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [destination]
+
+
+@pytest.mark.asyncio
+async def test_adownload_file_drops_authorization(tmp_path):
+    """
+    Test that an async download never forwards the client's API credentials.
+    """
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, content=b"data")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler),
+                                 headers={"Authorization": "Bearer secret"}) as client:
+        await File._adownload_file("https://cdn.example.com/image.jpg",
+                                   str(tmp_path / "image.jpg"), client=client)
+    assert "Authorization" not in seen[0].headers
+
+
+def test_download_file_streams_through_the_session(tmp_path):
+    """
+    Test that a blocking download writes every chunk of the streamed response.
+    """
+    response = MagicMock()
+    response.__enter__.return_value.iter_content.return_value = iter([b"abc", b"def"])
+    destination = str(tmp_path / "video.mp4")
+    with patch("mediaichemy.tools.filehandling._session.get", return_value=response) as mock_get:
+        File._download_file("https://cdn.example.com/video.mp4", destination)
+
+    mock_get.assert_called_once_with("https://cdn.example.com/video.mp4", stream=True)
+    with open(destination, "rb") as f:
+        assert f.read() == b"abcdef"
+
+
+def test_file_data_is_loaded_on_first_access(tmp_path):
+    """
+    Test that a file's contents are only read when its data is used.
+    """
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"frames")
+    with patch.object(MP4File, "load", return_value=b"frames") as mock_load:
+        video = MP4File(str(path))
+        mock_load.assert_not_called()
+        assert video.data == b"frames"
+        assert video.data == b"frames"
+    mock_load.assert_called_once()
+
+
+def test_mp4_duration_is_probed_once(tmp_path):
+    """
+    Test that the video length is probed with ffprobe only on the first call.
+    """
+    video = MP4File(str(tmp_path / "video.mp4"))
+    with patch("mediaichemy.tools.filehandling.subprocess.run",
+               return_value=MagicMock(stdout="5.5\n")) as mock_run:
+        assert video.get_duration() == 5.5
+        assert video.get_duration() == 5.5
+    mock_run.assert_called_once()
+
+
+def test_mp4_duration_is_read_from_the_header():
+    """
+    Test that the video length is read from the movie header without running ffprobe.
+    """
+    video = MP4File("tests/resources/expected/short_video/en_edited_video.mp4")
+    with patch("mediaichemy.tools.filehandling.subprocess.run") as mock_run:
+        assert video.get_duration() == pytest.approx(15.666)
+    mock_run.assert_not_called()
+
+
+def test_mp4_duration_of_a_silent_video_is_read_from_the_header():
+    """
+    Test that a video without an audio track gets its length from the movie header.
+    """
+    video = MP4File("tests/resources/mocks/short_video/video.mp4")
+    with patch("mediaichemy.tools.filehandling.subprocess.run") as mock_run:
+        assert video.get_duration() == pytest.approx(5.64)
+    mock_run.assert_not_called()
+
+
+def test_mp3_duration_is_parsed_once():
+    """
+    Test that the MP3 header is only parsed on the first duration request.
+    """
+    speech = MP3File("tests/resources/mocks/short_video/en_speech.mp3")
+    with patch("mediaichemy.tools.filehandling.MP3", wraps=MP3) as mock_mp3:
+        duration = speech.get_duration()
+        assert duration > 0
+        assert speech.get_duration() == duration
+    mock_mp3.assert_called_once()
@@ -0,0 +1,36 @@
+import pytest
+import langcodes
+from unittest.mock import patch
+from mediaichemy.tools.language import Language, LanguageTexts, _resolve_language, get_languages
+
+
+def test_get_languages_is_cached():
+    """
+    Test that the same list of languages is resolved once and then reused.
+    """
+    languages = get_languages(["en", "portuguese"])
+    assert languages.codes == ["en", "pt"]
+    assert languages.names == ["English", "Portuguese"]
+    assert get_languages(["en", "portuguese"]) is languages
+    assert get_languages(["pt"]) is not languages
+
+
+def test_language_resolution_is_cached():
+    """
+    Test that a language input is resolved by langcodes only the first time it is seen.
+    """
+    _resolve_language.cache_clear()
+    with patch("mediaichemy.tools.language.langcodes.find", wraps=langcodes.find) as mock_find:
+        assert (Language("Spanish").code, Language("Spanish").name) == ("es", "Spanish")
+    mock_find.assert_called_once_with("Spanish")
+
+
+def test_language_texts_are_keyed_by_code():
+    """
+    Test that texts are looked up by their resolved language code.
+    """
+    texts = LanguageTexts({"English": "Hello", "pt": "Olá"})
+    assert texts.texts == {"en": "Hello", "pt": "Olá"}
+    assert texts.get_text("en") == "Hello"
+    with pytest.raises(ValueError):
+        texts.get_text("es")
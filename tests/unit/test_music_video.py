@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from mediaichemy.content.music_video import MusicVideoCreator
+
+
+def test_music_video_creator_builds_prompt_lazily():
+    """
+    Test that the YouTube captions are only fetched when the prompt is first needed, and only once.
+    """
+    with patch("mediaichemy.content.music_video.YoutubeCaption") as mock_caption:
+        mock_caption.return_value.get_subtitles.return_value = [{'start': 0, 'end': 1, 'text': 'Hello'}]
+        creator = MusicVideoCreator()
+        mock_caption.assert_not_called()
+
+        assert "These are the subtitles: \n[{'start': 0, 'end': 1, 'text': 'Hello'}]" in creator.prompt
+        assert creator.prompt is creator.prompt
+        assert creator.subtitles == [{'start': 0, 'end': 1, 'text': 'Hello'}]
+    mock_caption.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_music_is_downloaded_while_video_is_extended():
+    """
+    Test that the music download and the video extension run concurrently.
+    """
+    content = MagicMock(state="video_created", dir="tests/resources/temp_content",
+                        start=3, duration=10, image_prompt="a prompt",
+                        STATES={"video_created": [2, None], "video_edited": [4, None]})
+    download_started = asyncio.Event()
+
+    async def extend_to_duration(video, **kwargs):
+        await download_started.wait()
+        return video
+
+    async def download_from_youtube(urls, output_path):
+        download_started.set()
+        return "audio"
+
+    edited = MagicMock()
+    with patch("mediaichemy.content.creator.edit_video.extend_to_duration",
+               AsyncMock(side_effect=extend_to_duration)), \
+         patch("mediaichemy.content.creator.edit_audio.download_from_youtube",
+               AsyncMock(side_effect=download_from_youtube)), \
+         patch("mediaichemy.content.creator.edit_video.add_audio_to_video",
+               AsyncMock(return_value=edited)) as mock_add_audio, \
+         patch("mediaichemy.content.checkpoint._save_state"):
+        await asyncio.wait_for(MusicVideoCreator.run_video_editing2(content, "video", "https://youtu.be/a",
+                                                                    extension_method="loop"), 5)
+
+    mock_add_audio.assert_awaited_once_with("video", "audio", start=3, duration=10)
+    edited.move_to.assert_called_once_with("tests/resources/temp_content/edited_video.mp4")
@@ -0,0 +1,192 @@
+import asyncio
+import base64
+import httpx
+import pytest
+from elevenlabs import VoiceSettings
+from unittest.mock import AsyncMock, MagicMock, patch
+from mediaichemy.ai.provider import HTTP_TIMEOUT, MAX_CONCURRENT_REQUESTS, request_slots
+from mediaichemy.ai.providers.elevenlabs import ElevenLabsProvider
+from mediaichemy.ai.providers.minimax import MinimaxProvider
+from mediaichemy.ai.providers.openrouter import OpenRouterProvider
+from mediaichemy.ai.providers.runware import RunwareProvider
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_reused():
+    """
+    Test that a provider keeps a single pooled HTTP client across requests.
+    """
+    provider = OpenRouterProvider()
+    client = provider.http_client
+    assert provider.http_client is client
+    assert str(client.base_url) == "https://openrouter.ai/api/v1/"
+    assert client.headers["Authorization"] == "Bearer mocked_openrouter_api_key"
+    assert client.timeout.read == 60.0
+
+    await provider.aclose()
+    assert client.is_closed
+    assert provider.http_client is not client
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_per_provider():
+    """
+    Test that each provider gets a client bound to its own base URL.
+    """
+    openrouter = OpenRouterProvider()
+    minimax = MinimaxProvider()
+    assert openrouter.http_client is not minimax.http_client
+    assert str(minimax.http_client.base_url) == "https://api.minimaxi.chat/v1/"
+    assert minimax.http_client.timeout.read == HTTP_TIMEOUT
+    await openrouter.aclose()
+    await minimax.aclose()
+
+
+@pytest.mark.asyncio
+async def test_minimax_polling_backs_off():
+    """
+    Test that Minimax status polling starts short and grows up to the cap.
+    """
+    provider = MinimaxProvider()
+    statuses = [("", "Processing")] * 8 + [("", "Fail")]
+    with patch.object(MinimaxProvider, "check_status", AsyncMock(side_effect=statuses)), \
+         patch("mediaichemy.ai.providers.minimax.asyncio.sleep", AsyncMock()) as mock_sleep:
+        result = await provider._poll_and_download("task", "video.mp4")
+
+    assert result is None
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert len(delays) == 9
+    assert 2.0 <= delays[0] <= 2.2
+    assert all(later > earlier for earlier, later in zip(delays[:7], delays[1:7]))
+    assert all(30.0 <= delay <= 33.0 for delay in delays[7:])
+
+
+def test_minimax_payload_encodes_image():
+    """
+    Test that the Minimax payload embeds the image as a base64 data URI.
+    """
+    image_path = "tests/resources/mocks/short_video/image.jpg"
+    with open(image_path, "rb") as f:
+        expected = base64.b64encode(f.read()).decode("ascii")
+
+    payload = MinimaxProvider()._prepare_payload(image_path, "a prompt", "I2V-01")
+    assert payload["model"] == "I2V-01"
+    assert payload["prompt"] == "a prompt"
+    assert payload["first_frame_image"] == f"data:image/jpeg;base64,{expected}"
+
+
+def test_elevenlabs_synthesize_writes_stream(tmp_path):
+    """
+    Test that ElevenLabs synthesis writes every non-empty audio chunk to the output file.
+    """
+    provider = ElevenLabsProvider()
+    provider.client = MagicMock()
+    provider.client.text_to_speech.convert.return_value = iter([b"abc", b"", b"def"])
+    output_path = str(tmp_path / "speech.mp3")
+
+    provider._synthesize("Hello", output_path, voice_id="voice", voice_settings=provider.voice_settings)
+
+    with open(output_path, "rb") as f:
+        assert f.read() == b"abcdef"
+    kwargs = provider.client.text_to_speech.convert.call_args.kwargs
+    assert kwargs["voice_id"] == "voice"
+    assert kwargs["text"] == "Hello"
+    assert kwargs["voice_settings"] is provider.voice_settings
+    assert isinstance(provider.voice_settings, VoiceSettings)
+
+
+def test_runware_build_inference():
+    """
+    Test that the Runware inference uses the configured model and image settings.
+    """
+    provider = RunwareProvider()
+    for _ in range(2):
+        inference = provider.build_inference("a prompt")
+        assert inference.model == "runware:101@1"
+        assert inference.positivePrompt == "a prompt"
+        assert inference.height == 1344
+        assert inference.width == 768
+
+
+@pytest.mark.asyncio
+async def test_runware_client_is_reused():
+    """
+    Test that the Runware WebSocket client is connected once and then reused.
+    """
+    provider = RunwareProvider()
+    client = MagicMock()
+    client.connect = AsyncMock()
+    client.connected.return_value = True
+    with patch("mediaichemy.ai.providers.runware.Runware", return_value=client) as mock_runware:
+        assert await provider._get_client() is client
+        assert await provider._get_client() is client
+    mock_runware.assert_called_once_with(api_key="mocked_runware_api_key")
+    client.connect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_runware_request_batch(tmp_path):
+    """
+    Test that a batch request runs one inference and downloads every image.
+    """
+    provider = RunwareProvider()
+    client = MagicMock()
+    client.imageInference = AsyncMock(return_value=[MagicMock(imageURL=f"https://img/{i}.jpg")
+                                                    for i in range(3)])
+    with patch.object(RunwareProvider, "_get_client", AsyncMock(return_value=client)), \
+         patch("mediaichemy.ai.providers.runware.JPEGFile._adownload_file", AsyncMock()) as mock_download:
+        paths = await provider.request_batch("a prompt", n=3, output_dir=str(tmp_path))
+
+    assert paths == [str(tmp_path / f"image_{i}.jpg") for i in range(3)]
+    client.imageInference.assert_awaited_once()
+    assert client.imageInference.call_args.kwargs["requestImage"].numberResults == 3
+    assert sorted(call.args[0] for call in mock_download.call_args_list) == [f"https://img/{i}.jpg"
+                                                                             for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_honours_retry_after():
+    """
+    Test that a Retry-After header pauses the provider before its next call.
+    """
+    provider = OpenRouterProvider()
+    provider._observe_rate_limit(httpx.Response(429, headers={"Retry-After": "5"}))
+    with patch("mediaichemy.ai.provider.asyncio.sleep", AsyncMock()) as mock_sleep:
+        async with provider._api_call():
+            pass
+    assert 4.0 < mock_sleep.call_args.args[0] <= 5.0
+
+    provider._retry_at = 0.0
+    provider._observe_rate_limit(httpx.Response(200))
+    with patch("mediaichemy.ai.provider.asyncio.sleep", AsyncMock()) as mock_sleep:
+        async with provider._api_call():
+            pass
+    mock_sleep.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_minimax_check_status_parses_response():
+    """
+    Test that the Minimax status check reads the file ID and status from the JSON body.
+    """
+    provider = MinimaxProvider()
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"file_id": "42", "status": "Success"}))
+    provider._http_client = httpx.AsyncClient(transport=transport, base_url=provider.base_url)
+    provider._http_client_loop = asyncio.get_running_loop()
+
+    assert await provider.check_status("task") == ("42", "Success")
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request_slots_are_shared():
+    """
+    Test that every provider call on a loop draws from the same bounded semaphore.
+    """
+    slots = request_slots()
+    assert request_slots() is slots
+    async with OpenRouterProvider()._api_call():
+        assert slots._value == MAX_CONCURRENT_REQUESTS - 1
+    assert slots._value == MAX_CONCURRENT_REQUESTS
@@ -1,9 +1,12 @@
 from mediaichemy.tools.filehandling import JPEGFile, MP4File, MP3File
+from mediaichemy.content.checkpoint import _save_state, checkpoint
 from mediaichemy.content.short_video import ShortVideoPrompt, ShortVideo, ShortVideoCreator
+import asyncio
 import pytest
 import logging
 import os
 import shutil
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -53,6 +56,9 @@ def test_generate_prompt():
     assert "Languages should be represented by their respective codes:" in generated_prompt
     assert "en, es" in generated_prompt
 
+    prompt.img_tags = "tag3"
+    assert "First tags are: tag3" in prompt.generate_prompt()
+
 
 def test_short_video_initialization():
     """
@@ -83,6 +89,9 @@ def test_short_video_initialization():
     assert short_video.captions.get_text("es") == "Una vista impresionante del atardecer."
     assert short_video.languages == ["en", "es"]
 
+    short_video.languages.append("pt")
+    assert ShortVideo(input=input_data).languages == ["en", "es"]
+
 
 @pytest.mark.asyncio
 async def test_short_video_states(copy_mock_short_video):
@@ -208,3 +217,153 @@ async def test_short_video_creator():
 
     # Assert that the directory no longer exists
     assert not os.path.exists(content.dir), f"Directory still exists: {content.dir}"
+
+
+@pytest.mark.asyncio
+async def test_short_video_speech_creation(mock_providers, copy_mock_short_video):
+    """
+    Test that speech is requested for every language and mapped back to its language.
+    """
+    short_video = ShortVideo("tests/resources/temp_content/idea.json")
+    speechs = await ShortVideoCreator.run_speech_creation(short_video)
+
+    assert list(speechs) == ["en", "pt"]
+    for language, speech in speechs.items():
+        assert isinstance(speech, MP3File)
+        assert speech.filepath == f"{short_video.dir}/{language}_speech.mp3"
+    assert mock_providers["mock_elevenlabs"].call_count == 2
+    assert short_video.state == "speech_created"
+
+
+@pytest.mark.asyncio
+async def test_short_video_speech_starts_early(mock_providers, copy_mock_short_video):
+    """
+    Test that speech requested ahead of time is picked up by the speech checkpoint,
+    and that no speech is requested once the checkpoint has been reached.
+    """
+    short_video = ShortVideo("tests/resources/temp_content/idea.json")
+    pending_speechs = ShortVideoCreator.start_speech_requests(short_video)
+    speechs = await ShortVideoCreator.run_speech_creation(short_video, pending_speechs)
+
+    assert list(speechs) == ["en", "pt"]
+    assert short_video.state == "speech_created"
+    assert ShortVideoCreator.start_speech_requests(short_video) is None
+    assert mock_providers["mock_elevenlabs"].call_count == 2
+
+
+def test_short_video_prompt_is_shared():
+    """
+    Test that creators with the same configuration reuse one formatted prompt.
+    """
+    assert ShortVideoCreator().prompt is ShortVideoCreator().prompt
+
+
+@pytest.mark.asyncio
+async def test_short_video_extends_video_once(copy_mock_short_video):
+    """
+    Test that the video is extended a single time, to the longest speech, while the shared
+    background is downloaded, and that each language is then rendered in one step.
+    """
+    short_video = ShortVideo("tests/resources/temp_content/idea.json")
+    short_video.state = "speech_created"
+    video = MP4File(f"{short_video.dir}/video.mp4")
+    speechs = {language: MagicMock() for language in short_video.languages}
+    speechs["en"].get_duration.return_value = 4.0
+    speechs["pt"].get_duration.return_value = 6.5
+    download_started = asyncio.Event()
+
+    async def download_background(output_path):
+        download_started.set()
+        return "background"
+
+    async def extend_to_duration(video, **kwargs):
+        # The extension only finishes once the download is under way
+        await download_started.wait()
+        return video
+
+    async def render_final(video, speech, output_path, **kwargs):
+        return MagicMock(filepath=output_path)
+
+    with patch("mediaichemy.content.creator.edit_audio.download_background",
+               AsyncMock(side_effect=download_background)), \
+         patch("mediaichemy.content.creator.edit_video.render_final",
+               AsyncMock(side_effect=render_final)) as mock_render, \
+         patch("mediaichemy.content.creator.edit_video.extend_to_duration",
+               AsyncMock(side_effect=extend_to_duration)) as mock_extend:
+        edited_videos = await asyncio.wait_for(
+            ShortVideoCreator.run_video_editing(short_video, video, speechs, extension_method="loop"), 5)
+
+    mock_extend.assert_awaited_once()
+    assert mock_extend.call_args.kwargs["target_duration"] == 6.5 + 6
+    assert mock_render.await_count == 2
+    for call in mock_render.call_args_list:
+        assert call.args[0] is video
+        assert call.kwargs["background"] == "background"
+        assert call.kwargs["silence"] == 6
+        assert call.kwargs["relative_volume"] == 0.7
+    assert sorted(edited_videos) == ["en", "pt"]
+    for language, edited_video in edited_videos.items():
+        assert edited_video.filepath == f"{short_video.dir}/{language}_edited_video.mp4"
+
+
+def test_list_files_filters_by_extension(copy_mock_short_video):
+    """
+    Test that files are listed recursively and filtered by extension, given as a list or a string.
+    """
+    short_video = ShortVideo("tests/resources/temp_content/idea.json")
+    os.makedirs(os.path.join(short_video.dir, "extra"))
+    nested = os.path.join(short_video.dir, "extra", "clip.MP4")
+    open(nested, "wb").close()
+
+    all_files = short_video.list_files()
+    assert sorted(all_files) == sorted(os.path.join(root, name)
+                                       for root, _, files in os.walk(short_video.dir) for name in files)
+    assert all_files[-1] == nested
+    videos = [path for path in all_files if path.lower().endswith("mp4")]
+    assert sorted(short_video.list_files(["mp4"])) == sorted(videos)
+    assert short_video.list_files("jpg") == [os.path.join(short_video.dir, "image.jpg")]
+
+
+def test_purge_keeps_idea_and_finished_videos(copy_mock_short_video):
+    """
+    Test that a purge only deletes intermediate files.
+    """
+    short_video = ShortVideo("tests/resources/temp_content/idea.json")
+    os.makedirs(os.path.join(short_video.dir, "extra"))
+    for name in ("en_edited_video.mp4", "video_loop.mp4"):
+        open(os.path.join(short_video.dir, name), "wb").close()
+
+    short_video.purge()
+    assert sorted(os.listdir(short_video.dir)) == ["en_edited_video.mp4", "extra",
+                                                   "idea.json", "image.jpg", "video.mp4"]
+
+
+def test_state_is_replaced_atomically(copy_mock_short_video):
+    """
+    Test that saving a state replaces the state file without leaving the temporary file behind.
+    """
+    short_video = ShortVideo("tests/resources/temp_content/idea.json")
+    short_video.state = "image_created"
+    with patch("mediaichemy.content.checkpoint.os.replace", wraps=os.replace) as mock_replace:
+        _save_state(short_video)
+
+    mock_replace.assert_called_once_with(f"{short_video.dir}/.state.tmp", f"{short_video.dir}/.state")
+    assert not os.path.exists(f"{short_video.dir}/.state.tmp")
+    short_video.load_state()
+    assert short_video.state == "image_created"
+
+
+def test_sync_checkpoint_returns_its_result(tmp_path):
+    """
+    Test that a checkpointed sync function returns its result directly and is skipped once reached.
+    """
+    content = MagicMock(dir=str(tmp_path), state="initialized",
+                        STATES={"initialized": (0, None), "image_created": (1, "skipped")})
+
+    @checkpoint("image_created")
+    def create_image(content):
+        return "image"
+
+    assert create_image(content) == "image"
+    assert content.state == "image_created"
+    assert create_image(content) == "skipped"
@@ -0,0 +1,103 @@
+import subprocess
+import sys
+import pytest
+from typing import Union, get_type_hints
+from unittest.mock import patch
+from mediaichemy.tools.utils import STDERR_TAIL_BYTES, _validate_type, extract_json, run_command, validate_types
+
+
+@pytest.mark.asyncio
+async def test_run_command_raises_on_failure():
+    """
+    Test that a failing command raises CalledProcessError with its stderr attached.
+    """
+    await run_command([sys.executable, "-c", "print('ok')"])
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        await run_command([sys.executable, "-c", "import sys; sys.exit('boom')"])
+    assert error.value.returncode == 1
+    assert b"boom" in error.value.stderr
+
+
+@pytest.mark.asyncio
+async def test_run_command_keeps_only_the_end_of_stderr():
+    """
+    Test that only the last bytes of a verbose command's stderr are kept.
+    """
+    stderr = await run_command([sys.executable, "-c",
+                                "import sys; sys.stderr.write('x' * 100000 + 'done')"])
+    assert len(stderr) == STDERR_TAIL_BYTES
+    assert stderr.endswith("done")
+
+
+@pytest.mark.asyncio
+async def test_run_command_feeds_stdin():
+    """
+    Test that input is written to the command's stdin.
+    """
+    stderr = await run_command([sys.executable, "-c",
+                                "import sys; sys.stderr.write(sys.stdin.read().upper())"],
+                               input=b"concat list")
+    assert stderr == "CONCAT LIST"
+
+
+def test_validate_types_resolves_hints_once():
+    """
+    Test that type hints are resolved on the first call only and still checked on every call.
+    """
+    class Idea:
+        @validate_types
+        def __init__(self, input: Union[str, dict], tags: list[str]) -> None:
+            pass
+
+    with patch("mediaichemy.tools.utils.get_type_hints", wraps=get_type_hints) as mock_hints:
+        Idea("idea.json", tags=[])
+        Idea({"title": "idea"}, tags=["a", "b"])
+        with pytest.raises(TypeError):
+            Idea(42, tags=[])
+        with pytest.raises(TypeError):
+            Idea("idea.json", tags=["a", 1])
+    mock_hints.assert_called_once()
+
+
+def test_validate_types_checks_defaults_and_varargs():
+    """
+    Test that defaults, keyword-only and variadic parameters are checked like bound arguments.
+    """
+    class Idea:
+        @validate_types
+        def __init__(self, input: Union[str, dict], name: str = '', *, tags: list[str] = None) -> None:
+            self.name = name
+
+        @validate_types
+        def extend(self, *items: tuple) -> int:
+            return len(items)
+
+    assert Idea("idea.json", "idea", tags=["a"]).name == "idea"
+    with pytest.raises(TypeError, match="Argument 'name' must be of type"):
+        Idea("idea.json", name=1, tags=[])
+    with pytest.raises(TypeError):
+        Idea("idea.json")
+    with pytest.raises(TypeError):
+        Idea("idea.json", "idea", ["a"])
+    assert Idea("idea.json", tags=[]).extend("a", "b") == 2
+
+
+def test_union_validation():
+    """
+    Test that plain and generic union arms are both checked.
+    """
+    assert _validate_type("idea.json", Union[str, dict])
+    assert not _validate_type(42, Union[str, dict])
+    assert _validate_type(None, Union[str, None])
+    assert _validate_type(["a"], Union[list[str], None])
+    assert not _validate_type([1], Union[list[str], None])
+
+
+def test_extract_json_finds_every_object():
+    """
+    Test that every JSON object embedded in surrounding text is extracted in order.
+    """
+    text = 'Here you go: {"title": "a {b}"} and {not json} then {"title": "c", "tags": [1]}.'
+    assert list(extract_json(text)) == [{"title": "a {b}"}, {"title": "c", "tags": [1]}]
+    assert list(extract_json("[{'title': 'a'}]")) == [[{"title": "a"}]]